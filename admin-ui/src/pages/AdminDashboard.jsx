@@ -14,16 +14,14 @@ export default function AdminDashboard() {
     const loadStats = async () => {
       try {
         const [faqs, escalations, docs] = await Promise.all([
-          faqApi.getAll(),
-          escalationApi.getAll(),
+          faqApi.stats(),
+          escalationApi.stats(),
           documentApi.getAll(),
         ]);
 
         setStats({
-          faqs: Array.isArray(faqs) ? faqs.length : 0,
-          escalations: Array.isArray(escalations)
-            ? escalations.filter(e => !e.status || e.status === 'open').length
-            : 0,
+          faqs: faqs?.total ?? 0,
+          escalations: escalations?.by_status?.open ?? 0,
           documents: Array.isArray(docs) ? docs.length : 0,
         });
       } catch (err) {
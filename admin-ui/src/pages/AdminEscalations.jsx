@@ -4,7 +4,8 @@ import { escalationApi } from "../services/api";
 
 export default function AdminEscalations() {
   const [escalations, setEscalations] = useState([]);
-  const [allEscalations, setAllEscalations] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [counts, setCounts] = useState({ open: 0, resolved: 0, promoted: 0 });
   const [replyModal, setReplyModal] = useState(null);
   const [replyText, setReplyText] = useState("");
   const [loading, setLoading] = useState(false);
@@ -13,12 +14,18 @@ export default function AdminEscalations() {
   const [activeTab, setActiveTab] = useState("open");
   const [expandedEsc, setExpandedEsc] = useState(null);
 
+  // First page of the active tab + counts for every tab
   const load = async () => {
     try {
       setLoading(true);
       setError("");
-      const data = await escalationApi.getAll();
-      setAllEscalations(data || []);
+      const [page, stats] = await Promise.all([
+        escalationApi.getPage({ status: activeTab }),
+        escalationApi.stats(),
+      ]);
+      setEscalations(page.items || []);
+      setNextCursor(page.nextCursor);
+      setCounts({ open: 0, resolved: 0, promoted: 0, ...stats.by_status });
     } catch (err) {
       console.error("Load escalations error:", err);
       setError("Failed to load escalations. Please try again.");
@@ -27,19 +34,30 @@ export default function AdminEscalations() {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoading(true);
+      setError("");
+      const page = await escalationApi.getPage({ status: activeTab, cursor: nextCursor });
+      setEscalations(prev => [...prev, ...(page.items || [])]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Load more escalations error:", err);
+      setError("Failed to load more escalations. Please try again.");
+    } finally {
+      setLoading(false);
+    }
+  };
+
   useEffect(() => {
     load();
-  }, []);
+  }, [activeTab]);
 
-  useEffect(() => {
-    if (activeTab === "open") {
-      setEscalations(allEscalations.filter(e => e.status === "open"));
-    } else if (activeTab === "resolved") {
-      setEscalations(allEscalations.filter(e => e.status === "resolved"));
-    } else if (activeTab === "promoted") {
-      setEscalations(allEscalations.filter(e => e.status === "promoted"));
-    }
-  }, [activeTab, allEscalations]);
+  // An escalation that changed status leaves the current tab
+  const moveTo = (id, from, to) => {
+    setEscalations(prev => prev.filter(e => e.id !== id));
+    setCounts(prev => ({ ...prev, [from]: prev[from] - 1, [to]: prev[to] + 1 }));
+  };
 
   const submitReply = async () => {
     if (!replyText.trim()) {
@@ -56,14 +74,14 @@ export default function AdminEscalations() {
         replyText
       );
 
-      const updatedEsc = {
-        ...replyModal,
-        admin_answer: replyText,
-        status: "resolved",
-        resolved_at: new Date().toISOString()
-      };
-
-      setAllEscalations(prev => prev.map(esc => esc.id === replyModal.id ? updatedEsc : esc));
+      if (replyModal.status === "resolved") {
+        // edited reply: stays on this tab
+        setEscalations(prev =>
+          prev.map(e => e.id === replyModal.id ? { ...e, admin_answer: replyText } : e)
+        );
+      } else {
+        moveTo(replyModal.id, replyModal.status, "resolved");
+      }
 
       setReplyModal(null);
       setReplyText("");
@@ -95,9 +113,7 @@ export default function AdminEscalations() {
       setError("");
       const result = await escalationApi.promoteToFaq(esc.id);
 
-      setAllEscalations(prev =>
-        prev.map(e => e.id === esc.id ? { ...e, status: "promoted" } : e)
-      );
+      moveTo(esc.id, "resolved", "promoted");
 
       setSuccess(`Promoted to FAQ successfully! (ID: ${result.faq_id})`);
       setTimeout(() => setSuccess(""), 4000);
@@ -109,9 +125,9 @@ export default function AdminEscalations() {
     }
   };
 
-  const openCount = allEscalations.filter(e => e.status === "open").length;
-  const resolvedCount = allEscalations.filter(e => e.status === "resolved").length;
-  const promotedCount = allEscalations.filter(e => e.status === "promoted").length;
+  const openCount = counts.open;
+  const resolvedCount = counts.resolved;
+  const promotedCount = counts.promoted;
 
   return (
     <div className="min-h-screen bg-slate-50 p-6">
@@ -395,6 +411,20 @@ export default function AdminEscalations() {
           })}
         </div>
 
+        {/* Next page */}
+        {nextCursor && (
+          <div className="flex justify-center mt-6">
+            <button
+              onClick={loadMore}
+              className="bg-white hover:bg-slate-100 text-slate-600 border border-slate-200 px-5 py-2.5 rounded-2xl flex items-center gap-2 transition-all shadow-sm disabled:opacity-50 text-sm font-medium"
+              disabled={loading}
+            >
+              <ChevronDown size={16} />
+              Load more
+            </button>
+          </div>
+        )}
+
         {/* Reply Modal */}
         {replyModal && (
           <div className="fixed inset-0 bg-black/10 backdrop-blur-sm flex items-center justify-center z-50 p-4">
@@ -4,6 +4,8 @@ import { faqApi } from "../services/api";
 
 export default function AdminFaqs() {
   const [faqs, setFaqs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
   const [modalOpen, setModalOpen] = useState(false);
   const [viewModalOpen, setViewModalOpen] = useState(false);
   const [bulkModalOpen, setBulkModalOpen] = useState(false);
@@ -20,12 +22,18 @@ export default function AdminFaqs() {
   const [expandedFaq, setExpandedFaq] = useState(null);
   const [viewingFaq, setViewingFaq] = useState(null);
 
+  // First page for the current search (filtered server-side) + total count
   const loadFaqs = async () => {
     try {
       setLoading(true);
       setError("");
-      const data = await faqApi.getAll();
-      setFaqs(data);
+      const [page, stats] = await Promise.all([
+        faqApi.getPage({ q: searchTerm }),
+        faqApi.stats(),
+      ]);
+      setFaqs(page.items);
+      setNextCursor(page.nextCursor);
+      setTotal(stats.total);
     } catch (err) {
       console.error("Load FAQs error:", err);
       setError("Failed to load FAQs. Please try again.");
@@ -34,9 +42,26 @@ export default function AdminFaqs() {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoading(true);
+      setError("");
+      const page = await faqApi.getPage({ q: searchTerm, cursor: nextCursor });
+      setFaqs(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Load more FAQs error:", err);
+      setError("Failed to load more FAQs. Please try again.");
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Reload as the search changes (debounced)
   useEffect(() => {
-    loadFaqs();
-  }, []);
+    const timer = setTimeout(loadFaqs, searchTerm ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
 
   const openView = (faq) => {
     setViewingFaq(faq);
@@ -187,12 +212,6 @@ export default function AdminFaqs() {
     }
   };
 
-  const filteredFaqs = faqs.filter(
-    (faq) =>
-      faq.canonical_question?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      faq.answer_en?.toLowerCase().includes(searchTerm.toLowerCase())
-  );
-
   return (
     <div className="min-h-screen bg-slate-50 p-6">
       {/* Header with Logo */}
@@ -215,11 +234,11 @@ export default function AdminFaqs() {
           <div className="flex flex-col md:flex-row justify-between items-start md:items-center gap-4 mb-5">
             <div className="flex items-center gap-4">
               <div className="bg-blue-50 text-blue-600 px-5 py-3 rounded-2xl">
-                <p className="text-2xl font-bold">{faqs.length}</p>
+                <p className="text-2xl font-bold">{total}</p>
                 <p className="text-xs">Total FAQs</p>
               </div>
               <div className="bg-indigo-50 text-indigo-600 px-5 py-3 rounded-2xl">
-                <p className="text-2xl font-bold">{filteredFaqs.length}</p>
+                <p className="text-2xl font-bold">{faqs.length}</p>
                 <p className="text-xs">Showing</p>
               </div>
             </div>
@@ -290,14 +309,14 @@ export default function AdminFaqs() {
         )}
 
         {/* Empty State */}
-        {!loading && filteredFaqs.length === 0 && faqs.length > 0 && (
+        {!loading && faqs.length === 0 && total > 0 && searchTerm.trim() && (
           <div className="text-center py-16 bg-white rounded-3xl shadow-sm border border-slate-200">
             <Search className="mx-auto text-slate-300 mb-3" size={48} />
             <p className="text-slate-500">No FAQs match your search.</p>
           </div>
         )}
 
-        {!loading && faqs.length === 0 && (
+        {!loading && total === 0 && (
           <div className="text-center py-16 bg-white rounded-3xl shadow-sm border border-slate-200">
             <div className="text-6xl mb-3">📝</div>
             <p className="text-slate-500 mb-4">No FAQs yet. Start by adding one!</p>
@@ -313,7 +332,7 @@ export default function AdminFaqs() {
 
         {/* FAQ List */}
         <div className="space-y-4">
-          {filteredFaqs.map((faq) => (
+          {faqs.map((faq) => (
             <div
               className="bg-white rounded-3xl shadow-sm p-6 border border-slate-200 hover:shadow-md transition-all"
               key={faq.id}
@@ -376,6 +395,20 @@ export default function AdminFaqs() {
           ))}
         </div>
 
+        {/* Next page */}
+        {nextCursor && (
+          <div className="flex justify-center mt-6">
+            <button
+              onClick={loadMore}
+              className="bg-white hover:bg-slate-100 text-slate-600 border border-slate-200 px-5 py-2.5 rounded-2xl flex items-center gap-2 transition-all shadow-sm disabled:opacity-50 text-sm font-medium"
+              disabled={loading}
+            >
+              <ChevronDown size={16} />
+              Load more
+            </button>
+          </div>
+        )}
+
         {/* View Modal - Shows all questions and answer */}
         {viewModalOpen && viewingFaq && (
           <div className="fixed inset-0 bg-black/10 backdrop-blur-sm flex items-center justify-center z-50 p-4">
@@ -9,6 +9,17 @@ const httpMethods = {
         return r.json();
       }),
 
+  // Keyset-paginated lists: rows + the cursor for the next page (null on the last)
+  getPage: (endpoint) =>
+    fetch(`${API_BASE}${endpoint}`)
+      .then(r => {
+        if (!r.ok) throw new Error(`HTTP ${r.status}: ${r.statusText}`);
+        return r.json().then(items => ({
+          items,
+          nextCursor: r.headers.get("X-Next-Cursor"),
+        }));
+      }),
+
   post: (endpoint, body) =>
     fetch(`${API_BASE}${endpoint}`, {
       method: "POST",
@@ -43,8 +54,17 @@ const httpMethods = {
 
 // ==================== FAQ APIs ====================
 export const faqApi = {
-  // Get all FAQs with variants
-  getAll: () => httpMethods.get("/admin/faqs/"),
+  // One page of FAQs with variants, optionally filtered (question, variant or answer text)
+  getPage: ({ cursor = null, q = "" } = {}) => {
+    const params = new URLSearchParams();
+    if (cursor) params.set("cursor", cursor);
+    if (q.trim()) params.set("q", q.trim());
+    const query = params.toString();
+    return httpMethods.getPage(`/admin/faqs/${query ? `?${query}` : ""}`);
+  },
+
+  // { total }
+  stats: () => httpMethods.get("/admin/faqs/stats"),
 
   // Create single FAQ (canonical + answer + variants)
   create: (faq) => httpMethods.post("/admin/faqs/", faq),
@@ -68,13 +88,18 @@ export const faqApi = {
 
 // ==================== ESCALATION APIs ====================
 export const escalationApi = {
-  getAll: (status = null) => {
-    const endpoint = status
-      ? `/admin/escalations/?status=${status}`
-      : `/admin/escalations/`;
-    return httpMethods.get(endpoint);
+  // One page (server default size); pass nextCursor back for the following one
+  getPage: ({ status = null, cursor = null } = {}) => {
+    const params = new URLSearchParams();
+    if (status) params.set("status", status);
+    if (cursor) params.set("cursor", cursor);
+    const query = params.toString();
+    return httpMethods.getPage(`/admin/escalations/${query ? `?${query}` : ""}`);
   },
 
+  // Counts per status: { total, by_status }
+  stats: () => httpMethods.get("/admin/escalations/stats"),
+
   getById: (id) =>
     httpMethods.get(`/admin/escalations/${id}`),
 
@@ -127,13 +152,13 @@ export const api = {
   delete: httpMethods.delete,
 
   // FAQ shortcuts
-  getFaqs: faqApi.getAll,
+  getFaqs: faqApi.getPage,
   createFaq: faqApi.create,
   updateFaq: faqApi.update,
   deleteFaq: faqApi.delete,
 
   // Escalation shortcuts
-  getEscalations: escalationApi.getAll,
+  getEscalations: escalationApi.getPage,
   replyEscalation: escalationApi.reply,
   promoteEscalationToFaq: escalationApi.promoteToFaq,
 
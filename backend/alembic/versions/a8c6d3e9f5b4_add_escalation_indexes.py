@@ -0,0 +1,44 @@
+"""add escalation indexes
+
+Revision ID: a8c6d3e9f5b4
+Revises: f7b5c2d8e4a3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c6d3e9f5b4'
+down_revision: Union[str, Sequence[str], None] = 'f7b5c2d8e4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # status-filtered queue pages and per-status counts
+    op.create_index(
+        "ix_escalations_status_created_at",
+        "escalations",
+        ["status", "created_at", "id"],
+    )
+    # unfiltered queue pages
+    op.create_index(
+        "ix_escalations_created_at",
+        "escalations",
+        ["created_at", "id"],
+    )
+    # session filter and the latest-escalation lookup in chat history
+    op.create_index(
+        "ix_escalations_session_created_at",
+        "escalations",
+        ["session_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_escalations_session_created_at", table_name="escalations")
+    op.drop_index("ix_escalations_created_at", table_name="escalations")
+    op.drop_index("ix_escalations_status_created_at", table_name="escalations")
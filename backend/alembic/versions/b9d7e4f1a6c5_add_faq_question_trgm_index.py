@@ -0,0 +1,30 @@
+"""add pg_trgm index on faq question text
+
+Revision ID: b9d7e4f1a6c5
+Revises: a8c6d3e9f5b4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d7e4f1a6c5'
+down_revision: Union[str, Sequence[str], None] = 'a8c6d3e9f5b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # lexical FAQ fast path: `question_text % :q` similarity lookups
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_faq_questions_question_text_trgm "
+        "ON faq_questions USING gin (question_text gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_faq_questions_question_text_trgm")
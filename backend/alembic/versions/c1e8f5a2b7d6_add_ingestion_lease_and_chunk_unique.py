@@ -0,0 +1,49 @@
+"""add ingestion job lease, unique document chunk position
+
+Revision ID: c1e8f5a2b7d6
+Revises: b9d7e4f1a6c5
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1e8f5a2b7d6'
+down_revision: Union[str, Sequence[str], None] = 'b9d7e4f1a6c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Worker that currently owns a running job; progress writes are
+    # conditional on it, so a reclaimed job has exactly one writer
+    op.add_column(
+        "ingestion_jobs",
+        sa.Column("lease_token", postgresql.UUID(as_uuid=True), nullable=True)
+    )
+
+    # Drop duplicate chunk positions left by concurrent workers (keep one)
+    op.execute("""
+        DELETE FROM document_chunks a
+        USING document_chunks b
+        WHERE a.document_id = b.document_id
+          AND a.chunk_index = b.chunk_index
+          AND a.id > b.id
+    """)
+    op.create_unique_constraint(
+        "uq_document_chunks_document_id_chunk_index",
+        "document_chunks",
+        ["document_id", "chunk_index"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_document_chunks_document_id_chunk_index", "document_chunks", type_="unique"
+    )
+    op.drop_column("ingestion_jobs", "lease_token")
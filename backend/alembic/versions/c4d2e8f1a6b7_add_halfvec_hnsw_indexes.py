@@ -0,0 +1,43 @@
+"""add halfvec hnsw indexes
+
+Revision ID: c4d2e8f1a6b7
+Revises: b3e1c7a9d204
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e8f1a6b7'
+down_revision: Union[str, Sequence[str], None] = 'b3e1c7a9d204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# pgvector can't HNSW-index vector(3072) (max 2000 dims), but halfvec
+# supports up to 4000 dims. Index an expression cast instead of storing
+# a second column; queries must ORDER BY the same expression.
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding_hnsw
+        ON document_chunks
+        USING hnsw ((embedding::halfvec(3072)) halfvec_l2_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_faq_questions_embedding_hnsw
+        ON faq_questions
+        USING hnsw ((embedding::halfvec(3072)) halfvec_l2_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_faq_questions_embedding_hnsw")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding_hnsw")
@@ -0,0 +1,33 @@
+"""add ingestion job page progress
+
+Revision ID: d2f9a6b3c8e7
+Revises: c1e8f5a2b7d6
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f9a6b3c8e7'
+down_revision: Union[str, Sequence[str], None] = 'c1e8f5a2b7d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Streaming ingestion only knows the chunk total at the end;
+    # pages give a total while the job runs
+    op.add_column("ingestion_jobs", sa.Column("pages_total", sa.Integer(), nullable=True))
+    op.add_column(
+        "ingestion_jobs",
+        sa.Column("pages_done", sa.Integer(), nullable=False, server_default="0")
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_jobs", "pages_done")
+    op.drop_column("ingestion_jobs", "pages_total")
@@ -0,0 +1,56 @@
+"""add ingestion jobs
+
+Revision ID: d5f3a9b2c8e1
+Revises: c4d2e8f1a6b7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f3a9b2c8e1'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e8f1a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("filename", sa.Text(), nullable=False),
+        sa.Column("source_type", sa.Text(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=True),
+        sa.Column(
+            "document_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="SET NULL"),
+            nullable=True
+        ),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("stage", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("chunks_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Workers poll for the oldest queued job
+    op.create_index(
+        "ix_ingestion_jobs_status_created_at",
+        "ingestion_jobs",
+        ["status", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingestion_jobs_status_created_at", table_name="ingestion_jobs")
+    op.drop_table("ingestion_jobs")
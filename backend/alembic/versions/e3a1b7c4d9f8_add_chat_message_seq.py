@@ -0,0 +1,45 @@
+"""add chat message insert sequence for polling
+
+Revision ID: e3a1b7c4d9f8
+Revises: d2f9a6b3c8e7
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a1b7c4d9f8'
+down_revision: Union[str, Sequence[str], None] = 'd2f9a6b3c8e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows numbered in (created_at, id) order, new rows by identity
+    op.execute("ALTER TABLE chat_messages ADD COLUMN seq bigint")
+    op.execute("""
+        UPDATE chat_messages m
+        SET seq = o.rn
+        FROM (
+            SELECT id, row_number() OVER (ORDER BY created_at, id) AS rn
+            FROM chat_messages
+        ) o
+        WHERE m.id = o.id
+    """)
+    op.execute("ALTER TABLE chat_messages ALTER COLUMN seq SET NOT NULL")
+    op.execute("ALTER TABLE chat_messages ALTER COLUMN seq ADD GENERATED BY DEFAULT AS IDENTITY")
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('chat_messages', 'seq'), COALESCE(max(seq), 0) + 1, false)
+        FROM chat_messages
+    """)
+
+    # `since` polling: range scan on (session_id, seq)
+    op.create_index("ix_chat_messages_session_seq", "chat_messages", ["session_id", "seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_session_seq", table_name="chat_messages")
+    op.drop_column("chat_messages", "seq")
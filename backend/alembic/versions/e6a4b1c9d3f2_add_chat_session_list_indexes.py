@@ -0,0 +1,37 @@
+"""add chat session list indexes
+
+Revision ID: e6a4b1c9d3f2
+Revises: d5f3a9b2c8e1
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a4b1c9d3f2'
+down_revision: Union[str, Sequence[str], None] = 'd5f3a9b2c8e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # first user message per session (LATERAL ... LIMIT 1)
+    op.create_index(
+        "ix_chat_messages_session_role_created_at",
+        "chat_messages",
+        ["session_id", "role", "created_at"],
+    )
+    # a user's sessions, newest first (keyset pagination)
+    op.create_index(
+        "ix_chat_sessions_user_created_at",
+        "chat_sessions",
+        ["user_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_sessions_user_created_at", table_name="chat_sessions")
+    op.drop_index("ix_chat_messages_session_role_created_at", table_name="chat_messages")
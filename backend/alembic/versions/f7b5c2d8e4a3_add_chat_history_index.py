@@ -0,0 +1,30 @@
+"""add chat history index
+
+Revision ID: f7b5c2d8e4a3
+Revises: e6a4b1c9d3f2
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b5c2d8e4a3'
+down_revision: Union[str, Sequence[str], None] = 'e6a4b1c9d3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # history pages and `since` polling: range scan on (session_id, created_at)
+    op.create_index(
+        "ix_chat_messages_session_created_at",
+        "chat_messages",
+        ["session_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_session_created_at", table_name="chat_messages")
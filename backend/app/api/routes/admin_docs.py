@@ -1,33 +1,83 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import delete
+from sqlalchemy import delete, update
 from app.db.session import get_db
 from app.db.models.document import Document
 from app.db.models.document_chunk import DocumentChunk
-from app.services.ingestion import ingest_document
+from app.db.models.ingestion_job import IngestionJob
+from app.services.ingestion_jobs import enqueue_ingestion, job_status, ingestion_workers
 from app.services.chunking import chunk_text
-from app.services.embeddings import get_embedding
+from app.services.embeddings import get_embeddings
 from app.services.text_cleaning import clean_text
 from app.schemas.document import DocumentUpdateRequest
+from app.services.answer_cache import answer_cache
+import hashlib
+import logging
 import uuid
 
+logger = logging.getLogger("campusconnect")
+
 router = APIRouter(prefix="/documents", tags=["Admin Documents"])
 
 MIN_CHARS = 40
 
 
-# -------------------- Upload --------------------
-@router.post("/upload")
+# -------------------- Upload (queued, processed in background) --------------------
+@router.post("/upload", status_code=202)
 def upload_document(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
     try:
-        return ingest_document(file, db)
+        job = enqueue_ingestion(db, file.filename, file.file.read())
     except Exception as e:
-        print("\n🔥 DOCUMENT UPLOAD ERROR:", e, "\n")
+        logger.exception("Document upload failed: %s", file.filename)
         raise HTTPException(status_code=500, detail=str(e))
 
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": str(job.id), "status": job.status}
+    )
+
+
+# -------------------- Ingestion jobs --------------------
+@router.get("/jobs")
+def list_ingestion_jobs(limit: int = 50, db: Session = Depends(get_db)):
+    jobs = (
+        db.query(IngestionJob)
+        .order_by(IngestionJob.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [job_status(j) for j in jobs]
+
+
+@router.get("/jobs/{job_id}")
+def get_ingestion_job(job_id: uuid.UUID, db: Session = Depends(get_db)):
+    job = db.get(IngestionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@router.post("/jobs/{job_id}/retry")
+def retry_ingestion_job(job_id: uuid.UUID, db: Session = Depends(get_db)):
+    job = db.get(IngestionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "failed":
+        raise HTTPException(status_code=400, detail=f"Job is {job.status}, only failed jobs can be retried")
+
+    # the partial document was discarded on failure: starts over
+    job.status = "queued"
+    job.attempts = 0
+    job.error = None
+    db.commit()
+    ingestion_workers.wake()
+
+    return job_status(job)
+
 
 # -------------------- List --------------------
 @router.get("/")
@@ -51,7 +101,11 @@ def get_document(doc_id: uuid.UUID, db: Session = Depends(get_db)):
     }
 
 
-# -------------------- Edit document text + re-embed (TRANSACTION SAFE) --------------------
+# -------------------- Edit document text + incremental re-embed (TRANSACTION SAFE) --------------------
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 @router.put("/{doc_id}")
 def update_document_text(
     doc_id: uuid.UUID,
@@ -68,25 +122,52 @@ def update_document_text(
         raise HTTPException(status_code=404, detail="Document not found")
 
     try:
-        # 1️⃣ Update document text
-        doc.final_text = new_text
-
-        # 2️⃣ Delete old chunks
-        db.execute(
-            delete(DocumentChunk).where(
-                DocumentChunk.document_id == doc_id
-            )
-        )
-
-        # 3️⃣ Re-chunk
+        # 1️⃣ Re-chunk
         chunks = [
             c for c in chunk_text(new_text)
             if len(c.strip()) >= MIN_CHARS
         ]
 
-        # 4️⃣ Re-embed
+        # 2️⃣ Diff against existing chunks by content hash (embeddings not loaded)
+        existing = {}
+        for chunk_id, chunk_index, content in db.query(
+            DocumentChunk.id, DocumentChunk.chunk_index, DocumentChunk.content
+        ).filter(DocumentChunk.document_id == doc_id).order_by(DocumentChunk.chunk_index):
+            existing.setdefault(_content_hash(content), []).append((chunk_id, chunk_index))
+
+        reindex = []  # unchanged content, possibly moved
+        new_chunks = []  # (idx, content) needing an embedding
         for idx, chunk in enumerate(chunks):
-            emb = get_embedding(chunk)
+            matches = existing.get(_content_hash(chunk))
+            if matches:
+                chunk_id, old_index = matches.pop(0)
+                if old_index != idx:
+                    reindex.append({"id": chunk_id, "chunk_index": idx})
+            else:
+                new_chunks.append((idx, chunk))
+
+        stale_ids = [chunk_id for matches in existing.values() for chunk_id, _ in matches]
+
+        # 3️⃣ Embed only new / changed chunks, before any writes
+        embeddings = get_embeddings([chunk for _, chunk in new_chunks])
+
+        # 4️⃣ Apply the diff
+        doc.final_text = new_text
+        if stale_ids:
+            db.execute(delete(DocumentChunk).where(DocumentChunk.id.in_(stale_ids)))
+        if reindex:
+            # (document_id, chunk_index) is unique and checked per row:
+            # park moved chunks at negative positions, then flip them back
+            db.execute(update(DocumentChunk), [
+                {"id": r["id"], "chunk_index": -1 - r["chunk_index"]} for r in reindex
+            ])
+            db.execute(
+                update(DocumentChunk)
+                .where(DocumentChunk.document_id == doc_id, DocumentChunk.chunk_index < 0)
+                .values(chunk_index=-1 - DocumentChunk.chunk_index)
+                .execution_options(synchronize_session=False)
+            )
+        for (idx, chunk), emb in zip(new_chunks, embeddings):
             db.add(DocumentChunk(
                 document_id=doc_id,
                 chunk_index=idx,
@@ -96,15 +177,19 @@ def update_document_text(
 
         # ✅ SINGLE COMMIT
         db.commit()
+        answer_cache.invalidate()
 
         return {
             "status": "updated",
-            "chunks": len(chunks)
+            "chunks": len(chunks),
+            "reused": len(chunks) - len(new_chunks),
+            "re_embedded": len(new_chunks),
+            "deleted": len(stale_ids)
         }
 
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print("🔥 UPDATE DOCUMENT ERROR:", e)
+        logger.exception("Document update failed: %s", doc_id)
         raise HTTPException(status_code=500, detail="Failed to update document")
 
 
@@ -117,4 +202,5 @@ def delete_document(doc_id: uuid.UUID, db: Session = Depends(get_db)):
 
     db.delete(doc)
     db.commit()
+    answer_cache.invalidate()
     return {"status": "deleted"}
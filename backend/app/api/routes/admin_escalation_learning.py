@@ -5,6 +5,7 @@ from app.db.models.escalation import Escalation
 from app.db.models.faq import FAQ
 from app.db.models.faq import FAQQuestion
 from app.services.embeddings import get_embedding
+from app.services.faq_index import faq_index
 
 router = APIRouter(prefix="/escalations", tags=["Escalations Learning"])
 
@@ -60,6 +61,7 @@ def promote_escalation_to_faq(escalation_id: int, db: Session = Depends(get_db))
     # 5️⃣ Commit all changes
     db.commit()
     db.refresh(faq)
+    faq_index.refresh_faq(db, faq.id)
 
     return {
         "status": "promoted_to_faq",
@@ -1,5 +1,10 @@
-from fastapi import APIRouter,Depends,HTTPException
+from fastapi import APIRouter,Depends,HTTPException,Query,Response
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.orm import Session
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+import base64
+from app.core.config import settings
 from app.db.session import get_db
 from app.db.models.escalation import Escalation
 from app.schemas.chat import AdminResolution
@@ -7,18 +12,82 @@ from app.db.models.chat import ChatMessage
 
 router = APIRouter(prefix="/escalations",tags=[" Admin Escalations"])
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _encode_cursor(esc: Escalation) -> str:
+    # opaque and URL-safe: survives being pasted into ?cursor= unencoded
+    micros = (esc.created_at - _EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{micros}:{esc.id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        micros, esc_id = raw.split(":")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(esc_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _filtered(stmt, status, session_id, created_from, created_to):
+    if status:
+        stmt = stmt.where(Escalation.status == status)
+    if session_id:
+        stmt = stmt.where(Escalation.session_id == session_id)
+    if created_from:
+        stmt = stmt.where(Escalation.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(Escalation.created_at < created_to)
+    return stmt
+
+
 @router.get("/")
 def list_escalations(
-        status:str | None = None,
-        db:Session=Depends(get_db)
+        response: Response,
+        status: str | None = None,
+        session_id: UUID | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        limit: int = Query(settings.ADMIN_PAGE_SIZE, ge=1, le=500),
+        cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+        db: Session = Depends(get_db)
 ):
-    query = db.query(Escalation)
+    stmt = _filtered(select(Escalation), status, session_id, created_from, created_to)
 
-    if status:
-        query=query.filter(Escalation.status==status)
+    if cursor:
+        stmt = stmt.where(tuple_(Escalation.created_at, Escalation.id) < _decode_cursor(cursor))
+
+    stmt = stmt.order_by(Escalation.created_at.desc(), Escalation.id.desc())
+
+    # always one page; X-Next-Cursor is set while more rows remain
+    rows = db.scalars(stmt.limit(limit + 1)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1])
+
+    return rows
+
+
+@router.get("/stats")
+def escalation_stats(
+        session_id: UUID | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        db: Session = Depends(get_db)
+):
+    # one GROUP BY for every status
+    stmt = _filtered(
+        select(Escalation.status, func.count()).group_by(Escalation.status),
+        None, session_id, created_from, created_to
+    )
+    by_status = {status: count for status, count in db.execute(stmt)}
 
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status
+    }
 
-    return query.order_by(Escalation.created_at.desc()).all()
 
 @router.get("/{escalation_id}")
 def get_escalation(escalation_id:int,db:Session=Depends(get_db)):
@@ -28,7 +97,6 @@ def get_escalation(escalation_id:int,db:Session=Depends(get_db)):
     return esc
 
 
-from datetime import datetime
 @router.post("/{escalation_id}/reply")
 def reply_escalation(escalation_id: int, payload: AdminResolution, db: Session = Depends(get_db)):
     esc = db.get(Escalation, escalation_id)
@@ -1,35 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session, selectinload
+from app.core.config import settings
 from app.db.session import get_db
 from app.db.models.faq import FAQ
 from app.db.models.faq import FAQQuestion
 from app.schemas.faq import FAQCreate, FAQUpdate, FAQOut,FAQQuestionAdd,FAQBulkItem, FAQBulkUploadResponse
-from app.services.embeddings import get_embedding
+from app.services.embeddings import get_embedding, get_embeddings
+from app.services.faq_index import faq_index
+from app.services.faq_import import FAQBulkImporter, iter_csv_rows, iter_ndjson_rows
 
 router = APIRouter(prefix="/faqs", tags=["Admin FAQs"])
 
 
-# -------------------- LIST ALL FAQs --------------------
+# -------------------- LIST FAQs (keyset paginated) --------------------
 @router.get("/", response_model=list[FAQOut])
-def list_faqs(db: Session = Depends(get_db)):
-    faqs = db.query(FAQ).order_by(FAQ.id.desc()).all()
-
-    result = []
-    for faq in faqs:
-        questions = (
-            db.query(FAQQuestion)
-            .filter(FAQQuestion.faq_id == faq.id)
-            .all()
+def list_faqs(
+    response: Response,
+    limit: int = Query(settings.ADMIN_PAGE_SIZE, ge=1, le=500),
+    cursor: int | None = Query(None, description="X-Next-Cursor from the previous page"),
+    q: str | None = Query(None, description="Filter on question, variant or answer text"),
+    db: Session = Depends(get_db),
+):
+    # variants in one batched SELECT ... IN; embeddings never loaded
+    query = (
+        db.query(FAQ)
+        .options(
+            selectinload(FAQ.questions).load_only(
+                FAQQuestion.id, FAQQuestion.faq_id, FAQQuestion.question_text
+            )
         )
+        .order_by(FAQ.id.desc())
+    )
 
-        result.append({
-            "id": faq.id,
-            "canonical_question": faq.canonical_question,
-            "answer_en": faq.answer_en,
-            "questions": questions
-        })
+    if cursor is not None:
+        query = query.filter(FAQ.id < cursor)
+
+    if q and q.strip():
+        pattern = f"%{q.strip()}%"
+        query = query.filter(or_(
+            FAQ.canonical_question.ilike(pattern),
+            FAQ.answer_en.ilike(pattern),
+            FAQ.id.in_(
+                select(FAQQuestion.faq_id).where(FAQQuestion.question_text.ilike(pattern))
+            ),
+        ))
 
-    return result
+    # always one page; X-Next-Cursor is set while more rows remain
+    faqs = query.limit(limit + 1).all()
+    if len(faqs) > limit:
+        faqs = faqs[:limit]
+        response.headers["X-Next-Cursor"] = str(faqs[-1].id)
+
+    return faqs
+
+
+# -------------------- STATS --------------------
+@router.get("/stats")
+def faq_stats(db: Session = Depends(get_db)):
+    return {"total": db.scalar(select(func.count()).select_from(FAQ))}
 
 
 # -------------------- CREATE FAQ (POPUP FLOW) --------------------
@@ -50,9 +79,10 @@ def create_faq(payload: FAQCreate, db: Session = Depends(get_db)):
         if q.strip():
             all_questions.add(q.strip())
 
-    # 3️⃣ Insert question variants
-    for q in all_questions:
-        emb = get_embedding(q)
+    # 3️⃣ Insert question variants (one batched embedding call)
+    all_questions = list(all_questions)
+    embeddings = get_embeddings(all_questions)
+    for q, emb in zip(all_questions, embeddings):
         db.add(FAQQuestion(
             faq_id=faq.id,
             question_text=q,
@@ -60,6 +90,7 @@ def create_faq(payload: FAQCreate, db: Session = Depends(get_db)):
         ))
 
     db.commit()
+    faq_index.refresh_faq(db, faq.id)
 
     questions = (
         db.query(FAQQuestion)
@@ -93,29 +124,46 @@ def update_faq(
     if payload.answer_en:
         faq.answer_en = payload.answer_en.strip()
 
-    # 2️⃣ Update questions (FULL REPLACE STRATEGY)
+    # 2️⃣ Update questions (SET DIFF: unchanged variants keep their embeddings)
     if payload.questions is not None:
-        # delete old question variants
-        db.query(FAQQuestion).filter(
-            FAQQuestion.faq_id == faq_id
-        ).delete()
-
-        all_questions = set(payload.questions)
+        wanted = set(payload.questions)
         if payload.canonical_question:
-            all_questions.add(payload.canonical_question.strip())
+            wanted.add(payload.canonical_question.strip())
         else:
-            all_questions.add(faq.canonical_question)
-
-        for q in all_questions:
-            if q.strip():
-                emb = get_embedding(q.strip())
-                db.add(FAQQuestion(
-                    faq_id=faq_id,
-                    question_text=q.strip(),
-                    embedding=emb
-                ))
-
+            wanted.add(faq.canonical_question)
+        wanted = {q.strip() for q in wanted if q.strip()}
+
+        # existing variants, without loading embeddings
+        kept = set()
+        remove_ids = []
+        for question_id, text in (
+            db.query(FAQQuestion.id, FAQQuestion.question_text)
+            .filter(FAQQuestion.faq_id == faq_id)
+        ):
+            if text in wanted and text not in kept:
+                kept.add(text)
+            else:
+                remove_ids.append(question_id)  # removed, or a duplicate row
+
+        # embed only the added variants, in one batch
+        added = sorted(wanted - kept)
+        embeddings = get_embeddings(added)
+
+        if remove_ids:
+            db.query(FAQQuestion).filter(
+                FAQQuestion.id.in_(remove_ids)
+            ).delete(synchronize_session=False)
+
+        for q, emb in zip(added, embeddings):
+            db.add(FAQQuestion(
+                faq_id=faq_id,
+                question_text=q,
+                embedding=emb
+            ))
+
+    # ✅ Single transaction: answer, canonical and variant changes together
     db.commit()
+    faq_index.refresh_faq(db, faq.id)
 
     questions = (
         db.query(FAQQuestion)
@@ -140,6 +188,7 @@ def delete_faq(faq_id: int, db: Session = Depends(get_db)):
 
     db.delete(faq)  # FAQQuestions auto-delete (ON DELETE CASCADE)
     db.commit()
+    faq_index.remove_faq(faq_id)
 
     return {"status": "deleted"}
 
@@ -180,6 +229,7 @@ def add_faq_question(
         embedding=embedding
     ))
     db.commit()
+    faq_index.refresh_faq(db, faq_id)
 
     return {
         "status": "added",
@@ -192,64 +242,31 @@ def bulk_upload_faqs(
     payload: list[FAQBulkItem],
     db: Session = Depends(get_db),
 ):
-    inserted = 0
-    skipped = 0
-    errors: list[str] = []
-
+    importer = FAQBulkImporter(db)
     for idx, item in enumerate(payload):
-        try:
-            canonical = item.canonical_question.strip()
-            answer = item.answer_en.strip()
-
-            if not canonical or not answer:
-                skipped += 1
-                errors.append(f"Item {idx}: Missing canonical question or answer")
-                continue
-
-            # 🔒 Prevent duplicate FAQs (canonical-level)
-            exists = db.query(FAQ).filter(
-                FAQ.canonical_question == canonical
-            ).first()
-
-            if exists:
-                skipped += 1
-                errors.append(f"Item {idx}: FAQ already exists")
-                continue
-
-            # 1️⃣ Create FAQ
-            faq = FAQ(
-                canonical_question=canonical,
-                answer_en=answer
-            )
-            db.add(faq)
-            db.commit()
-            db.refresh(faq)
-
-            # 2️⃣ Collect all questions (canonical + variants)
-            all_questions = {canonical}
-            for q in item.questions or []:
-                if q.strip():
-                    all_questions.add(q.strip())
-
-            # 3️⃣ Insert question variants
-            for q in all_questions:
-                emb = get_embedding(q)
-                db.add(FAQQuestion(
-                    faq_id=faq.id,
-                    question_text=q,
-                    embedding=emb
-                ))
-
-            db.commit()
-            inserted += 1
-
-        except Exception as e:
-            db.rollback()
-            skipped += 1
-            errors.append(f"Item {idx}: {str(e)}")
+        importer.add(idx, item)
+    return importer.finish()
 
-    return {
-        "inserted": inserted,
-        "skipped": skipped,
-        "errors": errors
-    }
+
+# -------------------- BULK IMPORT (streamed CSV / NDJSON) --------------------
+@router.post("/bulk-import", response_model=FAQBulkUploadResponse)
+def bulk_import_faqs(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """
+    CSV: header canonical_question,answer_en,questions ("|"-separated).
+    NDJSON: one FAQBulkItem object per line.
+    """
+    filename = (file.filename or "").lower()
+    if filename.endswith(".csv"):
+        rows = iter_csv_rows(file.file)
+    elif filename.endswith((".ndjson", ".jsonl")):
+        rows = iter_ndjson_rows(file.file)
+    else:
+        raise HTTPException(status_code=400, detail="Upload a .csv or .ndjson file")
+
+    # parse errors are reported per row (see iter_csv_rows / iter_ndjson_rows)
+    importer = FAQBulkImporter(db)
+    importer.add_rows(rows)
+    return importer.finish()
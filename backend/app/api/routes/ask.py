@@ -1,21 +1,69 @@
-from fastapi import APIRouter, Depends
+import json
+import logging
+import anyio
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.schemas.ask import AskRequest, AskResponse
-from app.services.qa_pipeline import answer_question
-from app.db.session import get_db
-from fastapi import HTTPException
-from time import time
+from app.services.qa_pipeline import answer_question_async, stream_answer
+from app.db.session import get_db, SessionLocal
+from app.core.limiter import LLMOverloaded, admit
 
-REQUEST_WINDOW = 60   # seconds
-MAX_REQUESTS = 20     # per minute
-request_log = {}
+logger = logging.getLogger("campusconnect")
 
 router = APIRouter(prefix="/api/chat")
 
 @router.post("/send", response_model=AskResponse)
-def send(req: AskRequest, db: Session = Depends(get_db)):
-    return answer_question(
+async def send(req: AskRequest, request: Request, db: Session = Depends(get_db)):
+    # 429 when over the session/IP rate; LLM overload → 503 (app handler)
+    admit(request, req.session_id)
+    return await answer_question_async(
         db=db,
         question=req.question,
         session_id=req.session_id
     )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/stream")
+async def send_stream(req: AskRequest, request: Request):
+    """
+    Server-Sent Events variant of /send.
+    Events: meta → token (1..n) → done. FAQ hits arrive as a single token.
+    """
+    # Rate limit before the stream opens, so a 429 is a real status code
+    admit(request, req.session_id)
+
+    async def event_source():
+        # Own DB session: it must outlive the handler and stay open
+        # until the stream is finished
+        db = SessionLocal()
+        events = stream_answer(db, req.question, req.session_id)
+        try:
+            async for event, data in events:
+                if await request.is_disconnected():
+                    break
+                yield _sse(event, data)
+        except LLMOverloaded as e:
+            yield _sse("error", {"detail": "The assistant is busy, please try again shortly",
+                                 "retry_after": e.retry_after})
+        except Exception:
+            # Headers are already sent; report in-band and end the stream
+            logger.exception("Streaming answer failed")
+            yield _sse("error", {"detail": "Something went wrong"})
+        finally:
+            with anyio.CancelScope(shield=True):
+                await events.aclose()
+            db.close()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+        },
+    )
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, true, tuple_
 from sqlalchemy.orm import Session
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+from app.core.config import settings
 from app.db.session import get_db
 from app.db.models.chat import ChatSession
 from app.db.models.chat import ChatMessage
@@ -10,35 +12,70 @@ from app.schemas.chat import ChatHistoryResponse, ChatMessageResponse
 
 router = APIRouter(prefix="/chat", tags=["Chat Sessions"])
 
-# 1. List user's chat sessions
+# 1. List user's chat sessions (+ first question, one query)
+def _encode_cursor(created_at: datetime, session_id) -> str:
+    return f"{created_at.isoformat()}_{session_id}"
+
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, session_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), UUID(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/sessions")
 def list_sessions(
     user_id: UUID,
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
-    sessions = (
-        db.query(ChatSession)
-        .filter(ChatSession.user_id == user_id)
-        .order_by(ChatSession.created_at.desc())
-        .all()
+    first_msg = (
+        select(ChatMessage.content)
+        .where(
+            ChatMessage.session_id == ChatSession.id,
+            ChatMessage.role == "user"
+        )
+        .order_by(ChatMessage.created_at.asc())
+        .limit(1)
+        .correlate(ChatSession)
+        .lateral("first_msg")
     )
 
-    result = []
-    for s in sessions:
-        first_msg = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.session_id == s.id, ChatMessage.role == "user")
-            .order_by(ChatMessage.created_at.asc())
-            .first()
+    stmt = (
+        select(ChatSession.id, ChatSession.created_at, first_msg.c.content)
+        .outerjoin(first_msg, true())
+        .where(ChatSession.user_id == user_id)
+        .order_by(ChatSession.created_at.desc(), ChatSession.id.desc())
+    )
+
+    if cursor:
+        stmt = stmt.where(
+            tuple_(ChatSession.created_at, ChatSession.id) < _decode_cursor(cursor)
         )
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    rows = db.execute(stmt).all()
 
-        result.append({
-            "session_id": s.id,
-            "first_question": first_msg.content if first_msg else None,
-            "created_at": s.created_at
-        })
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
 
-    return {"sessions": result}
+    return {
+        "sessions": [
+            {
+                "session_id": r.id,
+                "first_question": r.content,
+                "created_at": r.created_at
+            }
+            for r in rows
+        ],
+        "next_cursor": next_cursor
+    }
 
 
 
@@ -61,40 +98,124 @@ def create_new_session(payload: dict, db: Session = Depends(get_db)):
 
 
 
-# 3. Get full chat history (for reopen)
+# 3. Get chat history (for reopen / polling)
+def _history_position(db: Session, session_id: UUID, value: str):
+    """A message id or an ISO timestamp → (created_at, id) keyset position."""
+    try:
+        message_id = UUID(value)
+    except ValueError:
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor must be a message id or ISO timestamp")
+        # created_at is naive UTC
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment, None
+
+    row = db.execute(
+        select(ChatMessage.created_at, ChatMessage.id).where(
+            ChatMessage.id == message_id,
+            ChatMessage.session_id == session_id
+        )
+    ).first()
+    if not row:
+        raise HTTPException(status_code=400, detail="Cursor message not found in this session")
+    return row.created_at, row.id
+
+
+def _after(position):
+    created_at, message_id = position
+    if message_id is None:
+        return ChatMessage.created_at > created_at
+    return tuple_(ChatMessage.created_at, ChatMessage.id) > (created_at, message_id)
+
+
+def _before(position):
+    created_at, message_id = position
+    if message_id is None:
+        return ChatMessage.created_at < created_at
+    return tuple_(ChatMessage.created_at, ChatMessage.id) < (created_at, message_id)
+
+
 @router.get("/{session_id}", response_model=dict)
 def get_history(
     session_id: UUID,
+    before: str | None = Query(None, description="Message id or timestamp; older messages"),
+    after: str | None = Query(None, description="Message id or timestamp; newer messages"),
+    since: int | None = Query(
+        None, ge=0,
+        description="`cursor` from the previous response (polling); may repeat messages, de-duplicate by id"
+    ),
+    limit: int | None = Query(None, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    msgs = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.created_at.asc())
-        .all()
+    stmt = select(
+        ChatMessage.id, ChatMessage.role, ChatMessage.content, ChatMessage.created_at, ChatMessage.seq
+    ).where(
+        ChatMessage.session_id == session_id
     )
 
-    out = []
-    for m in msgs:
-        out.append({
+    if after:
+        stmt = stmt.where(_after(_history_position(db, session_id, after)))
+    if since is not None:
+        # Insert order, not the client-side created_at. seq is assigned at
+        # INSERT, not at commit: a transaction can hold a lower seq and
+        # commit after a poll has moved past it. Re-reading the last
+        # CHAT_POLL_OVERLAP values picks those up (clients drop ids they
+        # already have); a writer that lags further than that is missed.
+        stmt = stmt.where(ChatMessage.seq > since - settings.CHAT_POLL_OVERLAP)
+    if before:
+        stmt = stmt.where(_before(_history_position(db, session_id, before)))
+
+    # `before` pages backwards: newest-first in SQL, flipped below
+    newest_first = bool(before) and not (after or since is not None)
+    if newest_first:
+        stmt = stmt.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+    elif since is not None:
+        stmt = stmt.order_by(ChatMessage.seq.asc())
+    else:
+        stmt = stmt.order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
+
+    # re-read rows (seq <= since) don't count against `limit`; seq is
+    # global, so the window holds at most CHAT_POLL_OVERLAP of them
+    overlap = settings.CHAT_POLL_OVERLAP if since is not None else 0
+    if limit is not None:
+        stmt = stmt.limit(limit + overlap + 1)
+
+    rows = db.execute(stmt).all()
+    # seq order: the re-read rows come first
+    reread = [r for r in rows if r.seq <= since] if since is not None else []
+    rows = rows[len(reread):]
+    has_more = limit is not None and len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+    rows = reread + rows
+    if newest_first:
+        rows.reverse()
+
+    out = [
+        {
+            "id": m.id,
             "role": m.role,
             "content": m.content,
             "created_at": m.created_at
-        })
+        }
+        for m in rows
+    ]
 
-    escalation = (
-        db.query(Escalation)
-        .filter(Escalation.session_id == session_id)
+    escalation_status = db.scalar(
+        select(Escalation.status)
+        .where(Escalation.session_id == session_id)
         .order_by(Escalation.created_at.desc())
-        .first()
+        .limit(1)
     )
 
-    escalation_status = escalation.status if escalation else None
-
-    out.sort(key=lambda x: x["created_at"].timestamp())
-
     return {
         "session_id": session_id,
         "messages": out,
-        "escalation_status": escalation_status
+        "escalation_status": escalation_status,
+        "has_more": has_more,
+        # pass back as `since` to get what was written after these messages
+        "cursor": max([m.seq for m in rows] + [since or 0])
     }
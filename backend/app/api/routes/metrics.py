@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from app.db.session import pool_stats
+from app.services.embedding_cache import embedding_cache
+from app.services.answer_cache import answer_cache
+from app.services.faq_index import faq_index
+from app.services.faq_lexical import lexical_stats
+from app.services.chat_store import conversation_writer
+from app.services.prompt import prompt_stats
+from app.services import language
+from app.services.single_flight import embedding_flight, llm_flight
+from app.core.limiter import ip_limiter, llm_gate, session_limiter
+
+router = APIRouter(prefix="/metrics", tags=["Admin Metrics"])
+
+
+@router.get("/")
+def get_metrics():
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "answer_cache": answer_cache.stats(),
+        "faq_index": faq_index.stats(),
+        "faq_fast_path": lexical_stats.snapshot(),
+        "db_pool": pool_stats(),
+        "chat_writes": conversation_writer.stats(),
+        "language_detection": language.stats(),
+        "prompt_tokens": prompt_stats.snapshot(),
+        "single_flight": {
+            "embedding": embedding_flight.stats(),
+            "llm": llm_flight.stats(),
+        },
+        "admission": {
+            "session_rate_limit": session_limiter.stats(),
+            "ip_rate_limit": ip_limiter.stats(),
+            "llm": llm_gate.stats(),
+        },
+    }
@@ -5,10 +5,93 @@ class Settings(BaseSettings):
     LLM_API_URL: str
     OPENAI_API_KEY: str
     LLM_MODEL: str = "gpt-4o-mini"  # default (change if needed)
+    OPENAI_BASE_URL: str | None = None  # None → api.openai.com
     EMBEDDING_API_URL: str | None = None
     EMBEDDING_API_KEY: str | None = None
     EMBEDDING_MODEL: str = "text-embedding-3-small"
 
+    # DB connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 10  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; drop connections older than this
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15_000  # 0 = no timeout
+
+    # Embedding batching (multi-input requests)
+    EMBEDDING_BATCH_MAX_INPUTS: int = 256
+    EMBEDDING_BATCH_MAX_TOKENS: int = 250_000
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+
+    # Embedding cache (in-process LRU + Postgres table)
+    EMBEDDING_CACHE_SIZE: int = 10_000
+    EMBEDDING_CACHE_DB: bool = True
+
+    # HNSW (halfvec) search: candidate list size, higher = better recall
+    ANN_EF_SEARCH: int = 40
+
+    # Semantic answer cache (documents+LLM path)
+    SEMANTIC_CACHE_SIZE: int = 1000
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
+    SEMANTIC_CACHE_MAX_DISTANCE: float = 0.2
+
+    # In-memory FAQ index (disabled → SQL retrieval)
+    FAQ_INDEX_ENABLED: bool = True
+    FAQ_INDEX_REFRESH_SECONDS: int = 300
+
+    # Lexical FAQ fast path (before the query embedding)
+    LEXICAL_FAQ_ENABLED: bool = True
+    LEXICAL_TRGM_THRESHOLD: float = 0.8  # pg_trgm similarity, 1.0 = identical
+    LEXICAL_TRGM_MIN_CHARS: int = 12  # shorter questions: exact match only
+
+    # Admission control for /api/chat (per process)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_SESSION_PER_MINUTE: int = 20
+    RATE_LIMIT_SESSION_BURST: int = 10
+    RATE_LIMIT_IP_PER_MINUTE: int = 120  # campus NAT: many users per IP
+    RATE_LIMIT_IP_BURST: int = 30
+    RATE_LIMIT_MAX_KEYS: int = 50000  # LRU bound on tracked sessions/IPs
+    LLM_MAX_CONCURRENCY: int = 16  # in-flight LLM calls (async pipeline; see LLMGate)
+    LLM_MAX_QUEUE: int = 64  # callers waiting for a slot; beyond → 503
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10
+
+    # Language detection
+    LANG_FAST_PATH_MAX_CHARS: int = 200  # clearly-English ASCII up to this length → "en" without langdetect
+    LANG_CACHE_SIZE: int = 4096  # memoized classifier results
+
+    # LLM prompt packing (tokens, o200k_base)
+    PROMPT_MAX_TOKENS: int = 3000  # whole request: system + context + history + question
+    PROMPT_CHUNK_MAX_TOKENS: int = 800  # per document chunk (~500 words)
+    PROMPT_HISTORY_MAX_TOKENS: int = 600  # recent conversation, newest kept first
+
+    # Identical in-flight questions share one embedding / LLM call
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Chat turn writes: one commit per turn; optionally queued (write-behind)
+    CHAT_WRITE_BEHIND: bool = False
+    CHAT_WRITE_QUEUE_SIZE: int = 1000  # full → written inline
+    CHAT_WRITE_BATCH_SIZE: int = 100  # turns per background commit
+    CHAT_POLL_OVERLAP: int = 50  # seq values re-read behind `since`; clients de-duplicate by id
+
+    # Admin list endpoints (keyset paginated, X-Next-Cursor)
+    ADMIN_PAGE_SIZE: int = 50  # rows per page when ?limit is omitted
+
+    # Bulk FAQ import: rows per duplicate check / embed / insert / commit
+    FAQ_IMPORT_BATCH_SIZE: int = 500
+
+    # Background ingestion jobs
+    INGESTION_WORKERS: int = 2  # 0 = don't run workers in this process
+    INGESTION_POLL_SECONDS: int = 2
+    INGESTION_BATCH_SIZE: int = 64  # chunks per embed+insert commit
+    INGESTION_MAX_ATTEMPTS: int = 3
+    INGESTION_STALE_SECONDS: int = 600  # 'running' with no heartbeat → reclaimed
+    INGESTION_HEARTBEAT_SECONDS: int = 30  # lease renewal while a job runs (incl. OCR)
+
+    # OCR fallback for scanned PDF pages
+    OCR_WORKERS: int = 0  # 0 = one process per CPU
+    OCR_PAGE_WINDOW: int = 4  # pages rasterized at once per worker
+    OCR_DPI: int = 200
+
     class Config:
         env_file = ".env"
 
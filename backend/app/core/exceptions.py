@@ -1,6 +1,7 @@
 from fastapi import Request
 from fastapi.responses import JSONResponse
 import logging
+from app.core.limiter import LLMOverloaded
 
 logger = logging.getLogger("campusconnect")
 
@@ -13,3 +14,15 @@ async def global_exception_handler(request: Request, exc: Exception):
             "detail": "Something went wrong"
         }
     )
+
+
+async def llm_overloaded_handler(request: Request, exc: LLMOverloaded):
+    logger.warning("LLM queue full — rejecting %s", request.url.path)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={
+            "error": "Service Unavailable",
+            "detail": "The assistant is busy, please try again shortly"
+        }
+    )
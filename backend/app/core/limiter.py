@@ -1,3 +1,197 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-limiter = Limiter(key_func=get_remote_address)
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+
+
+# ---------- Per-client rate limiting ----------
+class TokenBucketLimiter:
+    """
+    Token bucket per key (session id, client IP). `rate_per_minute`
+    tokens refill continuously up to `burst`. Buckets live in an LRU
+    capped at `max_keys`, so memory stays bounded however many clients
+    show up; an evicted key simply starts again with a full bucket.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, max_keys: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()  # key → (tokens, updated)
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def _tokens(self, key: str, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def check(self, key: str) -> float:
+        """
+        0.0 if `key` has a token (not taken), else seconds until it has
+        one; a refusal counts as rejected.
+        """
+        with self._lock:
+            tokens = self._tokens(key, time.monotonic())
+            if tokens >= 1:
+                return 0.0
+            self.rejected += 1
+            return (1 - tokens) / self.rate
+
+    def acquire(self, key: str) -> float:
+        """0.0 if admitted, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, now)
+            self._buckets.pop(key, None)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+                self.allowed += 1
+            else:
+                wait = (1 - tokens) / self.rate
+                self.rejected += 1
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+            return wait
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
+
+
+session_limiter = TokenBucketLimiter(
+    settings.RATE_LIMIT_SESSION_PER_MINUTE, settings.RATE_LIMIT_SESSION_BURST, settings.RATE_LIMIT_MAX_KEYS
+)
+ip_limiter = TokenBucketLimiter(
+    settings.RATE_LIMIT_IP_PER_MINUTE, settings.RATE_LIMIT_IP_BURST, settings.RATE_LIMIT_MAX_KEYS
+)
+
+
+# check-then-take across both limiters is atomic
+_admit_lock = threading.Lock()
+
+
+def admit(request: Request, session_id) -> None:
+    """
+    Raises 429 with Retry-After when the session or client IP is over its
+    rate. Both buckets are checked before either is charged, so a request
+    refused by one limiter costs nothing in the other.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    client_ip = request.client.host if request.client else "unknown"
+    ip_key, session_key = f"ip:{client_ip}", f"session:{session_id}"
+    with _admit_lock:
+        wait = max(ip_limiter.check(ip_key), session_limiter.check(session_key))
+        if wait == 0:
+            ip_limiter.acquire(ip_key)
+            session_limiter.acquire(session_key)
+    if wait > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+# ---------- Global LLM concurrency ----------
+class LLMOverloaded(Exception):
+    """LLM wait queue is full (or the wait timed out); maps to 503."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"LLM capacity exhausted, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class LLMGate:
+    """
+    Caps in-flight LLM calls per process at `max_concurrent`.
+    At most `max_waiting` callers queue for a slot, for up to
+    `wait_timeout` seconds; anyone beyond that is rejected immediately
+    with LLMOverloaded, so a spike degrades into fast 503s instead of
+    everybody's latency collapsing.
+    Async only: it covers agenerate_answer and astream_answer, which
+    every route uses. The sync generate_answer (answer_question, the
+    benchmark baseline) is not gated.
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int, wait_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._sem = asyncio.Semaphore(max_concurrent)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_wait = 0.0
+        self._avg_call = 2.0  # seconds, EWMA of call duration
+
+    def retry_after(self) -> int:
+        # time for the current queue to drain, at least a second
+        return max(1, math.ceil(self._avg_call * (self.waiting + 1) / self.max_concurrent))
+
+    @asynccontextmanager
+    async def slot(self):
+        # own counters, not _sem.locked(): wait_for() acquires in a separate task
+        if self.in_flight + self.waiting >= self.max_concurrent + self.max_waiting:
+            self.rejected_queue_full += 1
+            raise LLMOverloaded(self.retry_after())
+
+        self.waiting += 1
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise LLMOverloaded(self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        acquired = time.monotonic()
+        self.max_wait = max(self.max_wait, acquired - start)
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._sem.release()
+            self._avg_call = 0.9 * self._avg_call + 0.1 * (time.monotonic() - acquired)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue": self.max_waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "max_wait_ms": round(1000 * self.max_wait, 1),
+            "avg_call_ms": round(1000 * self._avg_call, 1),
+        }
+
+
+llm_gate = LLMGate(
+    settings.LLM_MAX_CONCURRENCY, settings.LLM_MAX_QUEUE, settings.LLM_QUEUE_TIMEOUT_SECONDS
+)
@@ -4,3 +4,5 @@ from app.db.models.document_chunk import DocumentChunk
 from app.db.models.chat import ChatSession
 from app.db.models.chat import ChatMessage
 from app.db.models.user import User
+from app.db.models.embedding_cache import EmbeddingCache
+from app.db.models.ingestion_job import IngestionJob
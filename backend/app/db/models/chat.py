@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Text, DateTime, ForeignKey, Identity
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -23,5 +23,8 @@ class ChatMessage(Base):
     role = Column(String)
     content = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # assigned by Postgres at INSERT (not commit): the polling cursor, read
+    # with an overlap (see get_history); created_at is stamped when staged
+    seq = Column(BigInteger, Identity(), nullable=False)
 
     session = relationship("ChatSession", back_populates="messages")
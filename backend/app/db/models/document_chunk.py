@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, ForeignKey, DateTime, Integer
+from sqlalchemy import Column, Text, ForeignKey, DateTime, Integer, UniqueConstraint
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -7,6 +7,10 @@ from sqlalchemy.dialects.postgresql import UUID
 
 class DocumentChunk(Base):
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        # a chunk position exists once per document (ingestion inserts ON CONFLICT DO NOTHING)
+        UniqueConstraint("document_id", "chunk_index", name="uq_document_chunks_document_id_chunk_index"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id",ondelete="CASCADE"), nullable=False)
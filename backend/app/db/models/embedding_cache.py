@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Text, Integer, DateTime
+from pgvector.sqlalchemy import Vector
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+
+    # sha256(model | dimensions | normalized text)
+    key = Column(Text, primary_key=True)
+    model = Column(Text, nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    embedding = Column(Vector(3072), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
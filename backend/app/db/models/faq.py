@@ -1,5 +1,6 @@
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -11,6 +12,9 @@ class FAQ(Base):
     canonical_question = Column(Text, unique=True, nullable=False)
     answer_en = Column(Text, nullable=False)
 
+    # read-only (listing); rows are removed by ON DELETE CASCADE
+    questions = relationship("FAQQuestion", order_by="FAQQuestion.id", viewonly=True)
+
 
 class FAQQuestion(Base):
     __tablename__ = "faq_questions"
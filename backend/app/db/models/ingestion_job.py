@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Text, String, Integer, LargeBinary, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.db.base import Base
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    filename = Column(Text, nullable=False)
+    source_type = Column(Text, nullable=False)
+    payload = Column(LargeBinary)  # uploaded bytes, cleared once done
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    status = Column(String, nullable=False, default="queued")  # queued, running, done, failed
+    stage = Column(String, nullable=False, default="queued")  # extracting, embedding, done
+    chunks_total = Column(Integer, nullable=False, default=0)  # set when finished
+    chunks_done = Column(Integer, nullable=False, default=0)
+    pages_total = Column(Integer, nullable=True)  # source pages (DOCX paragraphs, TXT lines), known once opened
+    pages_done = Column(Integer, nullable=False, default=0)  # pages extracted in the current attempt
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_token = Column(UUID(as_uuid=True), nullable=True)  # owner of a running job, new per claim
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,8 +1,87 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+
+class PoolMetrics:
+    """Checkout wait times and timeouts, fed by InstrumentedQueuePool."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+
+        def pick(pct):
+            return recent[min(len(recent) - 1, int(len(recent) * pct))] if recent else 0.0
+
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(1000 * self.total_wait / self.checkouts, 3) if self.checkouts else 0.0,
+            "p50_wait_ms": round(1000 * pick(0.50), 3),
+            "p99_wait_ms": round(1000 * pick(0.99), 3),
+            "max_wait_ms": round(1000 * self.max_wait, 3),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record(time.perf_counter() - start)
+        return conn
+
+
+def _connect_options() -> str:
+    # default HNSW candidate list; per-query overrides use set_config
+    options = [f"-c hnsw.ef_search={settings.ANN_EF_SEARCH}"]
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        options.append(f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+    return " ".join(options)
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    future=True,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"options": _connect_options()}
+)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -16,3 +95,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def connection_for(db=None):
+    """
+    Yields the request session's connection when `db` is given (no extra
+    pool checkout), otherwise a short-lived pooled connection.
+    """
+    if db is not None:
+        yield db.connection()
+    else:
+        with engine.connect() as conn:
+            yield conn
+
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        **pool_metrics.snapshot(),
+    }
@@ -20,6 +20,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # keyset pagination on admin lists
 )
 
 # -------------------------------------------------
@@ -38,14 +39,54 @@ logger = logging.getLogger("campusconnect")
 def startup_event():
     logger.info("CampusConnect API starting up")
 
+    from app.core.config import settings
+
+    # language profiles load lazily on first detect(); do it here
+    from app.services.language import warm_up
+    warm_up()
+
+    # tiktoken downloads its encoding file on first use; same here
+    from app.services.tokens import warm_up as warm_up_tokenizer
+    warm_up_tokenizer()
+
+    from app.services.faq_index import faq_index
+    if settings.FAQ_INDEX_ENABLED:
+        try:
+            faq_index.load()
+        except Exception:
+            logger.exception("FAQ index load failed — falling back to SQL retrieval")
+        faq_index.start_auto_refresh(settings.FAQ_INDEX_REFRESH_SECONDS)
+
+    from app.services.ingestion_jobs import ingestion_workers
+    ingestion_workers.start(settings.INGESTION_WORKERS)
+
+    from app.services.chat_store import conversation_writer
+    if settings.CHAT_WRITE_BEHIND:
+        conversation_writer.start(settings.CHAT_WRITE_QUEUE_SIZE)
+
 @app.on_event("shutdown")
 def shutdown_event():
     logger.info("CampusConnect API shutting down")
 
+    # drain queued chat writes first
+    from app.services.chat_store import conversation_writer
+    conversation_writer.stop()
+
+    from app.services.faq_index import faq_index
+    faq_index.stop()
+
+    from app.services.ingestion_jobs import ingestion_workers
+    ingestion_workers.stop()
+
+    from app.services.text_extraction import shutdown_ocr_pool
+    shutdown_ocr_pool()
+
 # -------------------------------------------------
 # Exception handling
 # -------------------------------------------------
-from app.core.exceptions import global_exception_handler
+from app.core.exceptions import global_exception_handler, llm_overloaded_handler
+from app.core.limiter import LLMOverloaded
+app.add_exception_handler(LLMOverloaded, llm_overloaded_handler)
 app.add_exception_handler(Exception, global_exception_handler)
 
 # -------------------------------------------------
@@ -59,6 +100,7 @@ from app.api.routes.admin_escalation_learning import router as admin_escalation_
 from app.api.routes.chat_session import router as chat_sessions_router
 from app.api.routes.manual_escalation import router as manual_escalation_router
 from app.api.routes.auth import router as auth_router
+from app.api.routes.metrics import router as metrics_router
 
 app.include_router(chat_sessions_router, prefix="/api")
 
@@ -70,6 +112,7 @@ app.include_router(admin_faq_router, prefix="/admin")
 app.include_router(admin_docs_router, prefix="/admin")
 app.include_router(admin_escalations_router, prefix="/admin")
 app.include_router(admin_escalation_learning_router, prefix="/admin")
+app.include_router(metrics_router, prefix="/admin")
 
 # Manual escalation APIs
 app.include_router(manual_escalation_router)
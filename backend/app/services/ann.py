@@ -0,0 +1,17 @@
+from sqlalchemy import text
+from app.core.config import settings
+
+
+def apply_ef_search(conn, ef_search: int | None):
+    """
+    Overrides hnsw.ef_search for the current transaction only.
+    The connection-level default (ANN_EF_SEARCH) is set in app.db.session,
+    so the common case costs no extra round trip.
+    """
+    if ef_search is None or ef_search == settings.ANN_EF_SEARCH:
+        return
+
+    conn.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+        {"ef": str(int(ef_search))}
+    )
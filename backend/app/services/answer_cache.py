@@ -0,0 +1,137 @@
+import threading
+import time
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class SemanticAnswerCache:
+    """
+    Caches documents+LLM answers keyed on the query embedding.
+    A question within `max_distance` (L2, same metric as pgvector `<->`)
+    of a cached one, in the same language, reuses its answer.
+
+    Storage is a fixed (max_size x dim) float32 matrix, so a lookup is a
+    single matrix-vector product. Slots are recycled LRU-first.
+    Any change to the document set bumps `version` and empties the cache.
+    Entries are shared across sessions, so only answers generated without
+    chat history are stored or served (see qa_pipeline._cache_lookup).
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, max_distance: float, dim: int = 3072):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+
+        self._vectors = np.zeros((max_size, dim), dtype=np.float32)
+        self._sq_norms = np.zeros(max_size, dtype=np.float32)
+        self._valid = np.zeros(max_size, dtype=bool)
+        self._expires = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._langs: list[str | None] = [None] * max_size
+        self._values: list[dict | None] = [None] * max_size
+
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def lookup(self, query_embedding, lang: str) -> dict | None:
+        """Returns {"answer", "confidence"} of the nearest fresh entry, or None."""
+        if self.max_size <= 0:
+            return None
+
+        q = np.asarray(query_embedding, dtype=np.float32)
+        now = time.monotonic()
+
+        with self._lock:
+            expired = self._valid & (self._expires <= now)
+            if expired.any():
+                self._drop(expired)
+                self.expirations += int(expired.sum())
+
+            candidates = self._valid & np.array([l == lang for l in self._langs])
+            if not candidates.any():
+                self.misses += 1
+                return None
+
+            # ||v - q||² = ||v||² - 2 v·q + ||q||²
+            sq = self._sq_norms - 2 * (self._vectors @ q) + float(q @ q)
+            sq[~candidates] = np.inf
+            slot = int(np.argmin(sq))
+
+            if np.sqrt(max(sq[slot], 0.0)) > self.max_distance:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._last_used[slot] = now
+            return self._values[slot]
+
+    def store(self, query_embedding, lang: str, answer: str, confidence: float, version: int):
+        """`version` is self.version as seen before answering; stale answers are dropped."""
+        if self.max_size <= 0:
+            return
+
+        q = np.asarray(query_embedding, dtype=np.float32)
+        now = time.monotonic()
+
+        with self._lock:
+            if version != self.version:
+                return
+
+            free = np.flatnonzero(~self._valid)
+            if free.size:
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+
+            self._vectors[slot] = q
+            self._sq_norms[slot] = float(q @ q)
+            self._valid[slot] = True
+            self._expires[slot] = now + self.ttl_seconds
+            self._last_used[slot] = now
+            self._langs[slot] = lang
+            self._values[slot] = {"answer": answer, "confidence": confidence}
+            self.stores += 1
+
+    def invalidate(self):
+        """Call whenever documents/chunks are added, edited or deleted."""
+        with self._lock:
+            self.version += 1
+            self._drop(self._valid.copy())
+            self.invalidations += 1
+
+    def _drop(self, mask):
+        self._valid[mask] = False
+        for slot in np.flatnonzero(mask):
+            self._langs[slot] = None
+            self._values[slot] = None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": int(self._valid.sum()),
+            "max_size": self.max_size,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+answer_cache = SemanticAnswerCache(
+    max_size=settings.SEMANTIC_CACHE_SIZE,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+    max_distance=settings.SEMANTIC_CACHE_MAX_DISTANCE,
+)
@@ -1,6 +1,15 @@
+import logging
+import queue
+import threading
+from datetime import datetime
 from sqlalchemy.orm import Session
 from uuid import UUID
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.db.models.chat import ChatMessage
+from app.db.models.escalation import Escalation
+
+logger = logging.getLogger("campusconnect")
 
 def save_message(
         db:Session,
@@ -14,4 +23,176 @@ def save_message(
         content=content
     )
     db.add(msg)
-    db.commit()
\ No newline at end of file
+    db.commit()
+
+
+# -------------------- Unit of work for one chat turn --------------------
+class ConversationTurn:
+    """
+    Stages a turn's writes (user message, assistant message, escalation)
+    so they reach the database in one transaction via persist_turn.
+    Timestamps are taken when staged, so message order is preserved.
+    """
+
+    def __init__(self, session_id: UUID):
+        self.session_id = session_id
+        self.messages: list[ChatMessage] = []
+        self.escalation: Escalation | None = None
+
+    def add_message(self, role: str, content: str):
+        self.messages.append(ChatMessage(
+            session_id=self.session_id,
+            role=role,
+            content=content,
+            created_at=datetime.utcnow()
+        ))
+
+    def escalate(self, question: str, bot_answer: str | None, confidence: float | None):
+        self.escalation = Escalation(
+            question=question,
+            bot_answer=bot_answer,
+            confidence=confidence,
+            session_id=self.session_id,
+            status="open"
+        )
+
+    def __bool__(self):
+        return bool(self.messages) or self.escalation is not None
+
+    def clear(self):
+        self.messages = []
+        self.escalation = None
+
+
+def write_turns(db: Session, turns: list[ConversationTurn]):
+    """Adds every staged row, flushes (assigns escalation ids) and commits once."""
+    for turn in turns:
+        db.add_all(turn.messages)
+        if turn.escalation is not None:
+            db.add(turn.escalation)
+    db.flush()
+    escalation_ids = [t.escalation.id for t in turns if t.escalation is not None]
+    db.commit()
+    return escalation_ids
+
+
+def persist_turn(db: Session, turn: ConversationTurn) -> int | None:
+    """
+    Persists a turn and returns its escalation id (if any); the turn is
+    emptied, so persisting it again is a no-op.
+    In write-behind mode turns without an escalation are queued instead;
+    escalations are always written inline because the caller needs the id.
+    """
+    if not turn:
+        return None
+    if turn.escalation is None:
+        # the writer gets its own copy; `turn` is emptied below
+        staged = ConversationTurn(turn.session_id)
+        staged.messages = turn.messages
+        if conversation_writer.submit(staged):
+            turn.clear()
+            return None
+
+    ids = write_turns(db, [turn])
+    turn.clear()
+    return ids[0] if ids else None
+
+
+class ConversationWriter:
+    """
+    Optional write-behind (CHAT_WRITE_BEHIND): a bounded queue drained by
+    one background thread, up to CHAT_WRITE_BATCH_SIZE turns per commit.
+    When the queue is full, submit() returns False and the caller writes
+    inline (backpressure, nothing dropped). stop() drains the queue.
+    """
+
+    def __init__(self):
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        self.queued = 0
+        self.written = 0
+        self.inline_fallbacks = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, max_queue: int):
+        if self.running:
+            return
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._loop, name="chat-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, turn: ConversationTurn) -> bool:
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(turn)
+        except queue.Full:
+            self.inline_fallbacks += 1
+            return False
+        self.queued += 1
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < settings.CHAT_WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [t for t in batch if t is not _STOP]
+                # drain everything submitted before shutdown
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[ConversationTurn]):
+        db = SessionLocal()
+        try:
+            write_turns(db, batch)
+            self.written += len(batch)
+        except Exception:
+            db.rollback()
+            # isolate the bad turn(s); the rest still land
+            for turn in batch:
+                try:
+                    write_turns(db, [turn])
+                    self.written += 1
+                except Exception:
+                    db.rollback()
+                    self.failed += 1
+                    logger.exception("Write-behind: dropped chat turn for session %s", turn.session_id)
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queued": self.queued,
+            "written": self.written,
+            "inline_fallbacks": self.inline_fallbacks,
+            "failed": self.failed,
+        }
+
+
+_STOP = object()
+conversation_writer = ConversationWriter()
@@ -1,13 +1,24 @@
+from typing import Iterable, Iterator
+
+
+def iter_chunks(words: Iterable[str], size=500, overlap=50) -> Iterator[str]:
+    """
+    Sliding-window chunker over a word stream. Holds at most `size` words;
+    yields the same chunks as chunk_text.
+    """
+    step = size - overlap
+    buffer = []
+    for word in words:
+        buffer.append(word)
+        if len(buffer) == size:
+            yield " ".join(buffer)
+            buffer = buffer[step:]
+
+    # tail: every remaining window start, as chunk_text always produced
+    while buffer:
+        yield " ".join(buffer)
+        buffer = buffer[step:]
+
+
 def chunk_text(text: str, size=500, overlap=50):
-    words = text.split()
-    chunks = []
-    start = 0
-
-    while start < len(words):
-        end = start + size
-        chunks.append(" ".join(words[start:end]))
-        start=max(0,end-overlap)
-        if start>=end:
-            break
-
-    return chunks
+    return list(iter_chunks(text.split(), size, overlap))
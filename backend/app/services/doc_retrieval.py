@@ -1,17 +1,25 @@
 from sqlalchemy import text
-from app.db.session import engine
+from app.db.session import connection_for
+from app.services.ann import apply_ef_search
 
-def retrieve_documents(query_embedding, k=3):
+
+def retrieve_documents(query_embedding, k=3, ef_search: int | None = None, db=None):
     if not query_embedding:
         return []
 
-    with engine.connect() as conn:
+    # Reuse the request's connection when a session is passed
+    with connection_for(db) as conn:
+        apply_ef_search(conn, ef_search)
+
+        # Distance expression must match the HNSW index (halfvec cast).
+        # halfvec distances differ from full precision by ~1e-3.
         result = conn.execute(
             text("""
                 SELECT document_chunks.document_id,
                        document_chunks.content,
                        document_chunks.chunk_index,
-                       document_chunks.embedding <-> (:qvec)::vector AS distance
+                       document_chunks.embedding::halfvec(3072)
+                           <-> (:qvec)::vector::halfvec(3072) AS distance
                 FROM document_chunks
                 ORDER BY distance
                 LIMIT :k
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.db.session import engine
+from app.db.models.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger("campusconnect")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(model: str, dimensions: int, text: str) -> str:
+    raw = f"{model}|{dimensions}|{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCacheStore:
+    """
+    Two-tier embedding cache.
+    Tier 1: bounded in-process LRU.
+    Tier 2: `embedding_cache` table in Postgres (survives restarts).
+    """
+
+    def __init__(self, max_size: int, use_db: bool):
+        self.max_size = max_size
+        self.use_db = use_db
+        self._lru: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.api_calls = 0
+        self.api_seconds = 0.0
+        self.db_lookups = 0
+        self.db_seconds = 0.0
+
+    # -------------------- Memory tier --------------------
+    def _remember(self, key: str, embedding: list[float]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._lru[key] = embedding
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+
+    def _recall(self, key: str):
+        with self._lock:
+            emb = self._lru.get(key)
+            if emb is not None:
+                self._lru.move_to_end(key)
+                self.memory_hits += 1
+            return emb
+
+    # -------------------- Postgres tier --------------------
+    def _db_fetch(self, keys: list[str]) -> dict[str, list[float]]:
+        if not self.use_db or not keys:
+            return {}
+
+        start = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                rows = conn.execute(
+                    select(EmbeddingCache.key, EmbeddingCache.embedding)
+                    .where(EmbeddingCache.key.in_(keys))
+                ).all()
+        except Exception as e:
+            logger.warning("Embedding cache lookup failed: %s", e)
+            return {}
+        finally:
+            self.db_lookups += 1
+            self.db_seconds += time.perf_counter() - start
+
+        return {key: [float(x) for x in emb] for key, emb in rows}
+
+    def _db_store(self, model: str, dimensions: int, items: dict[str, list[float]]):
+        if not self.use_db or not items:
+            return
+
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    pg_insert(EmbeddingCache)
+                    .values([
+                        {
+                            "key": key,
+                            "model": model,
+                            "dimensions": dimensions,
+                            "embedding": emb,
+                        }
+                        for key, emb in items.items()
+                    ])
+                    .on_conflict_do_nothing(index_elements=["key"])
+                )
+        except Exception as e:
+            logger.warning("Embedding cache write failed: %s", e)
+
+    # -------------------- Public API --------------------
+    def _lookup(self, keys: list[str], use_db: bool = True) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+
+        # 1️⃣ Memory
+        for key in set(keys):
+            emb = self._recall(key)
+            if emb is not None:
+                found[key] = emb
+
+        # 2️⃣ Postgres
+        if use_db:
+            missing = [k for k in dict.fromkeys(keys) if k not in found]
+            from_db = self._db_fetch(missing)
+            for key, emb in from_db.items():
+                self._remember(key, emb)
+            self.db_hits += len(from_db)
+            found.update(from_db)
+
+        return found
+
+    def _pending(self, keys, texts, found) -> dict[str, str]:
+        to_compute = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in to_compute:
+                to_compute[key] = text
+        self.misses += len(to_compute)
+        return to_compute
+
+    def _record(self, model, dimensions, to_compute, computed, seconds):
+        self.api_calls += 1
+        self.api_seconds += seconds
+
+        fresh = dict(zip(to_compute.keys(), computed))
+        for key, emb in fresh.items():
+            self._remember(key, emb)
+        return fresh
+
+    def get_many(self, model: str, dimensions: int, texts: list[str], compute):
+        """
+        Returns embeddings for `texts` in order.
+        `compute(list[str]) -> list[embedding]` is called once,
+        for the texts neither tier knows about.
+        """
+        keys = [cache_key(model, dimensions, t) for t in texts]
+        found = self._lookup(keys)
+
+        # 3️⃣ API (deduplicated)
+        to_compute = self._pending(keys, texts, found)
+        if to_compute:
+            start = time.perf_counter()
+            computed = compute(list(to_compute.values()))
+            fresh = self._record(
+                model, dimensions, to_compute, computed, time.perf_counter() - start
+            )
+            self._db_store(model, dimensions, fresh)
+            found.update(fresh)
+
+        return [found[k] for k in keys]
+
+    async def aget_many(self, model: str, dimensions: int, texts: list[str], acompute):
+        """
+        Async twin of get_many: memory hits return without leaving the
+        event loop; Postgres lookups/writes run in the threadpool.
+        """
+        keys = [cache_key(model, dimensions, t) for t in texts]
+        found = self._lookup(keys, use_db=False)
+
+        if len(found) < len(set(keys)) and self.use_db:
+            missing = [k for k in dict.fromkeys(keys) if k not in found]
+            from_db = await run_in_threadpool(self._db_fetch, missing)
+            for key, emb in from_db.items():
+                self._remember(key, emb)
+            self.db_hits += len(from_db)
+            found.update(from_db)
+
+        to_compute = self._pending(keys, texts, found)
+        if to_compute:
+            start = time.perf_counter()
+            computed = await acompute(list(to_compute.values()))
+            fresh = self._record(
+                model, dimensions, to_compute, computed, time.perf_counter() - start
+            )
+            # Write-through off the request path; _db_store never raises
+            asyncio.get_running_loop().run_in_executor(
+                None, self._db_store, model, dimensions, fresh
+            )
+            found.update(fresh)
+
+        return [found[k] for k in keys]
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.db_hits
+        total = hits + self.misses
+        avg_api_ms = 1000 * self.api_seconds / self.api_calls if self.api_calls else 0.0
+        avg_db_ms = 1000 * self.db_seconds / self.db_lookups if self.db_lookups else 0.0
+
+        return {
+            "size": len(self._lru),
+            "max_size": self.max_size,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": hits / total if total else 0.0,
+            "api_calls": self.api_calls,
+            "avg_api_call_ms": round(avg_api_ms, 2),
+            "avg_db_lookup_ms": round(avg_db_ms, 2),
+            "api_calls_saved": hits,
+            "estimated_latency_saved_ms": round(
+                self.memory_hits * avg_api_ms
+                + self.db_hits * max(avg_api_ms - avg_db_ms, 0.0),
+                2
+            ),
+        }
+
+
+embedding_cache = EmbeddingCacheStore(
+    max_size=settings.EMBEDDING_CACHE_SIZE,
+    use_db=settings.EMBEDDING_CACHE_DB,
+)
@@ -1,27 +1,140 @@
+import httpx
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache
 
-def get_embedding(text: str) -> list[float]:
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+EMBEDDING_MODEL_NAME = "text-embedding-3-large"
+EMBEDDING_DIMENSIONS = 3072
+
+# One pooled HTTP session so batches reuse keep-alive connections
+_http = requests.Session()
+
+# Async twin for the event-loop pipeline (created lazily, inside the loop)
+_async_http: httpx.AsyncClient | None = None
+
+
+def _estimate_tokens(text: str) -> int:
+    # English averages ~4 chars/token; count 3 to stay safely under limits
+    return len(text) // 3 + 1
+
+
+def _request_kwargs(inputs) -> dict:
     if not settings.EMBEDDING_API_KEY:
         raise RuntimeError("Missing OpenAI API key")
 
-    response = requests.post(
-        "https://api.openai.com/v1/embeddings",
-        headers={
+    return {
+        "url": settings.EMBEDDING_API_URL or OPENAI_EMBEDDINGS_URL,
+        "headers": {
             "Authorization": f"Bearer {settings.EMBEDDING_API_KEY}",
             "Content-Type": "application/json",
         },
-        json={
-            "model": "text-embedding-3-large",
-            "input": text
+        "json": {
+            "model": EMBEDDING_MODEL_NAME,
+            "input": inputs
         },
-        timeout=30
-    )
+        "timeout": 30,
+    }
 
+
+def _parse_response(response):
     if response.status_code == 401:
         raise RuntimeError(
             "401 Unauthorized — check API key or billing status"
         )
 
     response.raise_for_status()
-    return response.json()["data"][0]["embedding"]
+
+    # API may return items out of order → sort by index
+    data = sorted(response.json()["data"], key=lambda d: d["index"])
+    return [d["embedding"] for d in data]
+
+
+def _post_embeddings(inputs):
+    return _parse_response(_http.post(**_request_kwargs(inputs)))
+
+
+async def _apost_embeddings(inputs):
+    global _async_http
+    if _async_http is None:
+        _async_http = httpx.AsyncClient()
+
+    return _parse_response(await _async_http.post(**_request_kwargs(inputs)))
+
+
+def get_embedding(text: str) -> list[float]:
+    return embedding_cache.get_many(
+        EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSIONS, [text], _post_embeddings
+    )[0]
+
+
+async def aget_embedding(text: str) -> list[float]:
+    return (await embedding_cache.aget_many(
+        EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSIONS, [text], _apost_embeddings
+    ))[0]
+
+
+def _make_batches(texts: list[str]) -> list[list[int]]:
+    """
+    Groups input positions into batches that respect both the
+    per-request input count and the per-request token limit.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = _estimate_tokens(text)
+
+        if current and (
+            len(current) >= settings.EMBEDDING_BATCH_MAX_INPUTS
+            or current_tokens + tokens > settings.EMBEDDING_BATCH_MAX_TOKENS
+        ):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def get_embeddings(texts: list[str]) -> list[list[float]]:
+    """
+    Embeds many texts using multi-input requests.
+    Cached texts are served from the embedding cache; the rest are
+    batched and run in parallel (bounded by EMBEDDING_MAX_CONCURRENCY).
+    Output order matches input order.
+    """
+    if not texts:
+        return []
+
+    return embedding_cache.get_many(
+        EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSIONS, texts, _embed_batched
+    )
+
+
+def _embed_batched(texts: list[str]) -> list[list[float]]:
+    batches = _make_batches(texts)
+    results: list[list[float] | None] = [None] * len(texts)
+
+    def run(batch):
+        return batch, _post_embeddings([texts[i] for i in batch])
+
+    if len(batches) == 1:
+        done = [run(batches[0])]
+    else:
+        workers = min(settings.EMBEDDING_MAX_CONCURRENCY, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(run, batches))
+
+    for batch, embeddings in done:
+        for i, emb in zip(batch, embeddings):
+            results[i] = emb
+
+    return results
@@ -0,0 +1,200 @@
+import codecs
+import csv
+import json
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.faq import FAQ, FAQQuestion
+from app.schemas.faq import FAQBulkItem
+from app.services.embeddings import get_embeddings
+from app.services.faq_index import faq_index
+
+# CSV: canonical_question, answer_en, questions ("|"-separated variants)
+CSV_QUESTION_SEPARATOR = "|"
+
+
+# -------------------- Parsing (streamed) --------------------
+def _guarded(rows: Iterator) -> Iterator:
+    """
+    Turns parse errors raised mid-stream into per-row error messages, so
+    the import still finishes and reports the batches already committed.
+    The csv reader resumes at the next record; undecodable bytes end the
+    stream.
+    """
+    while True:
+        try:
+            yield next(rows)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield f"Invalid CSV: {e}"
+        except UnicodeDecodeError as e:
+            yield f"Not valid UTF-8 ({e.reason}); rest of the file skipped"
+            return
+
+
+def iter_csv_rows(stream) -> Iterator[dict | str]:
+    """Yields dicts, or an error message for records that can't be parsed."""
+    for row in _guarded(iter(csv.DictReader(codecs.iterdecode(stream, "utf-8-sig")))):
+        if isinstance(row, str):
+            yield row
+            continue
+        questions = row.get("questions") or ""
+        yield {
+            "canonical_question": row.get("canonical_question") or "",
+            "answer_en": row.get("answer_en") or "",
+            "questions": [q for q in questions.split(CSV_QUESTION_SEPARATOR) if q.strip()],
+        }
+
+
+def iter_ndjson_rows(stream) -> Iterator[dict | str]:
+    """Yields dicts, or an error message for lines that aren't JSON objects."""
+    return _guarded(_ndjson_rows(stream))
+
+
+def _ndjson_rows(stream) -> Iterator[dict | str]:
+    for line in codecs.iterdecode(stream, "utf-8-sig"):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"Invalid JSON: {e.msg}"
+            continue
+        yield row if isinstance(row, dict) else "Expected a JSON object"
+
+
+# -------------------- Import --------------------
+class FAQBulkImporter:
+    """
+    Imports FAQs in batches of FAQ_IMPORT_BATCH_SIZE:
+    one duplicate query, one batched embedding pass, two multi-row
+    INSERTs and one commit per batch. If a batch fails to insert it is
+    retried item by item (savepoints) so errors stay per row.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.inserted = 0
+        self.skipped = 0
+        self.errors: list[str] = []
+        self._seen: set[str] = set()
+        self._batch: list[tuple[int, str, str, list[str]]] = []  # (idx, canonical, answer, questions)
+
+    def _skip(self, idx: int, reason: str):
+        self.skipped += 1
+        self.errors.append(f"Item {idx}: {reason}")
+
+    def add(self, idx: int, item: FAQBulkItem):
+        canonical = item.canonical_question.strip()
+        answer = item.answer_en.strip()
+
+        if not canonical or not answer:
+            self._skip(idx, "Missing canonical question or answer")
+            return
+
+        # 🔒 duplicates within the upload; existing rows are checked per batch
+        if canonical in self._seen:
+            self._skip(idx, "FAQ already exists")
+            return
+        self._seen.add(canonical)
+
+        all_questions = {canonical}
+        for q in item.questions or []:
+            if q.strip():
+                all_questions.add(q.strip())
+
+        self._batch.append((idx, canonical, answer, list(all_questions)))
+        if len(self._batch) >= settings.FAQ_IMPORT_BATCH_SIZE:
+            self.flush()
+
+    def add_rows(self, rows: Iterable[dict | str]):
+        for idx, row in enumerate(rows):
+            if isinstance(row, str):
+                self._skip(idx, row)
+                continue
+            try:
+                item = FAQBulkItem.model_validate(row)
+            except ValidationError as e:
+                self._skip(idx, "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+            self.add(idx, item)
+
+    def flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        # 1️⃣ Duplicates against existing FAQs: one set-based query
+        existing = set(self.db.scalars(
+            select(FAQ.canonical_question).where(
+                FAQ.canonical_question.in_([canonical for _, canonical, _, _ in batch])
+            )
+        ))
+        pending = []
+        for entry in batch:
+            if entry[1] in existing:
+                self._skip(entry[0], "FAQ already exists")
+            else:
+                pending.append(entry)
+        if not pending:
+            return
+
+        # 2️⃣ Embed every variant in batched requests
+        try:
+            flat = iter(get_embeddings(
+                [q for _, _, _, questions in pending for q in questions]
+            ))
+        except Exception as e:
+            for idx, *_ in pending:
+                self._skip(idx, str(e))
+            return
+        embedded = [(entry, [next(flat) for _ in entry[3]]) for entry in pending]
+
+        # 3️⃣ Multi-row inserts, one commit for the batch
+        try:
+            self._insert(embedded)
+            self.db.commit()
+            self.inserted += len(embedded)
+        except Exception:
+            self.db.rollback()
+            self._insert_one_by_one(embedded)
+
+    def _insert(self, embedded):
+        ids = dict(self.db.execute(
+            insert(FAQ).returning(FAQ.canonical_question, FAQ.id),
+            [{"canonical_question": canonical, "answer_en": answer}
+             for (_, canonical, answer, _), _ in embedded]
+        ).all())
+
+        self.db.execute(insert(FAQQuestion), [
+            {"faq_id": ids[canonical], "question_text": q, "embedding": emb}
+            for (_, canonical, _, questions), embeddings in embedded
+            for q, emb in zip(questions, embeddings)
+        ])
+
+    def _insert_one_by_one(self, embedded):
+        for entry in embedded:
+            try:
+                with self.db.begin_nested():
+                    self._insert([entry])
+                self.inserted += 1
+            except Exception as e:
+                self._skip(entry[0][0], str(e))
+        self.db.commit()
+
+    def finish(self) -> dict:
+        self.flush()
+        if self.inserted and faq_index.ready:
+            faq_index.load(self.db)  # one rebuild instead of a patch per FAQ
+        return {
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "errors": self.errors
+        }
@@ -0,0 +1,209 @@
+import logging
+import threading
+
+import numpy as np
+
+from app.db.session import SessionLocal
+from app.db.models.faq import FAQ, FAQQuestion
+from app.services.text_cleaning import normalize_question
+
+logger = logging.getLogger("campusconnect")
+
+
+class FAQIndex:
+    """
+    In-memory copy of faq_questions for retrieve_faqs.
+
+    Vectors live in one contiguous float32 matrix; a query is a single
+    matrix-vector product. Updates are copy-on-write: a new snapshot is
+    built and swapped in, so searches never see a half-patched index.
+    The snapshot also maps normalized question text → row for the
+    lexical fast path.
+
+    A full load reads without the lock. Patches made meanwhile are
+    journaled and replayed on top of the loaded snapshot, so a FAQ edit
+    committed during the read isn't overwritten by older rows.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None  # (matrix, sq_norms, rows) once loaded
+        self._exact: dict[str, dict] = {}
+        self._stop = threading.Event()
+
+        self._generation = 0  # bumped by every patch
+        self._loads_running = 0
+        self._journal: list[tuple[int, int, list, list]] = []  # (generation, faq_id, rows, vectors)
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @staticmethod
+    def _fetch(db, faq_id: int | None = None):
+        query = (
+            db.query(
+                FAQQuestion.faq_id,
+                FAQQuestion.question_text,
+                FAQQuestion.embedding,
+                FAQ.canonical_question,
+                FAQ.answer_en,
+            )
+            .join(FAQ, FAQ.id == FAQQuestion.faq_id)
+            .order_by(FAQQuestion.id)
+        )
+        if faq_id is not None:
+            query = query.filter(FAQQuestion.faq_id == faq_id)
+
+        rows, vectors = [], []
+        for fid, text, emb, canonical, answer in query.all():
+            rows.append({
+                "faq_id": fid,
+                "question": canonical,
+                "matched_variant": text,
+                "answer": answer,
+            })
+            vectors.append(np.asarray(emb, dtype=np.float32))
+        return rows, vectors
+
+    def _swap(self, rows: list[dict], vectors: list):
+        matrix = (
+            np.vstack(vectors).astype(np.float32, copy=False)
+            if vectors else np.zeros((0, 0), dtype=np.float32)
+        )
+        sq_norms = np.einsum("ij,ij->i", matrix, matrix) if vectors else np.zeros(0)
+
+        # normalized text shared by variants of different FAQs is ambiguous
+        exact, ambiguous = {}, set()
+        for row in rows:
+            for text in (row["matched_variant"], row["question"]):
+                key = normalize_question(text)
+                if not key:
+                    continue
+                if key in exact and exact[key]["faq_id"] != row["faq_id"]:
+                    ambiguous.add(key)
+                exact.setdefault(key, row)
+        for key in ambiguous:
+            del exact[key]
+
+        self._exact = exact
+        self._snapshot = (matrix, sq_norms, rows)
+
+    # -------------------- Build / patch --------------------
+    def load(self, db=None):
+        """Full rebuild from the database."""
+        with self._lock:
+            started = self._generation
+            self._loads_running += 1
+
+        own = db is None
+        db = db or SessionLocal()
+        try:
+            rows, vectors = self._fetch(db)
+
+            with self._lock:
+                self._swap(rows, vectors)
+                # patches since the read started may be missing from it
+                for generation, faq_id, new_rows, new_vectors in self._journal:
+                    if generation > started:
+                        self._apply(faq_id, new_rows, new_vectors)
+        finally:
+            if own:
+                db.close()
+            with self._lock:
+                self._loads_running -= 1
+                if not self._loads_running:
+                    self._journal.clear()
+
+        logger.info("FAQ index loaded: %d question variants", len(rows))
+
+    def refresh_faq(self, db, faq_id: int):
+        """Re-reads one FAQ's variants (after create/update/add-question)."""
+        if not self.ready and not self._loads_running:
+            return
+        new_rows, new_vectors = self._fetch(db, faq_id)
+        self._replace(faq_id, new_rows, new_vectors)
+
+    def remove_faq(self, faq_id: int):
+        if not self.ready and not self._loads_running:
+            return
+        self._replace(faq_id, [], [])
+
+    def _replace(self, faq_id: int, new_rows: list[dict], new_vectors: list):
+        with self._lock:
+            self._generation += 1
+            if self._loads_running:
+                self._journal.append((self._generation, faq_id, new_rows, new_vectors))
+            if self._snapshot is not None:
+                self._apply(faq_id, new_rows, new_vectors)
+
+    def _apply(self, faq_id: int, new_rows: list[dict], new_vectors: list):
+        # caller holds the lock
+        matrix, _, rows = self._snapshot
+        keep = [i for i, r in enumerate(rows) if r["faq_id"] != faq_id]
+        self._swap(
+            [rows[i] for i in keep] + new_rows,
+            [matrix[i] for i in keep] + new_vectors,
+        )
+
+    def start_auto_refresh(self, interval_seconds: int):
+        """
+        Periodic full reload. Write-through only patches the worker that
+        served the admin request; this bounds staleness in the others.
+        """
+        if interval_seconds <= 0:
+            return
+
+        def loop():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.load()
+                except Exception as e:
+                    logger.warning("FAQ index refresh failed: %s", e)
+
+        threading.Thread(target=loop, name="faq-index-refresh", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    # -------------------- Query --------------------
+    def search(self, query_embedding, k: int = 3) -> list[dict]:
+        matrix, sq_norms, rows = self._snapshot
+        if not rows:
+            return []
+
+        q = np.asarray(query_embedding, dtype=np.float32)
+        # ||v - q||² = ||v||² - 2 v·q + ||q||²
+        sq = sq_norms - 2 * (matrix @ q) + float(q @ q)
+
+        k = min(k, len(rows))
+        top = np.argpartition(sq, k - 1)[:k]
+        top = top[np.argsort(sq[top])]
+
+        return [
+            {
+                "question": rows[i]["question"],
+                "matched_variant": rows[i]["matched_variant"],
+                "answer": rows[i]["answer"],
+                "distance": float(np.sqrt(max(sq[i], 0.0))),
+            }
+            for i in top
+        ]
+
+    def lookup_exact(self, question: str) -> dict | None:
+        """FAQ whose variant/canonical text equals `question` after normalization."""
+        return self._exact.get(normalize_question(question))
+
+    def stats(self) -> dict:
+        if not self.ready:
+            return {"ready": False}
+        matrix, _, rows = self._snapshot
+        return {
+            "ready": True,
+            "variants": len(rows),
+            "exact_keys": len(self._exact),
+            "bytes": int(matrix.nbytes),
+        }
+
+
+faq_index = FAQIndex()
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from app.core.config import settings
+from app.services.faq_index import faq_index
+from app.services.text_cleaning import normalize_question
+
+logger = logging.getLogger("campusconnect")
+
+
+class LexicalStats:
+    """How often the lexical FAQ paths answer, what they cost and what they save."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.exact_hits = 0
+        self.lookup_seconds = 0.0
+        self.trigram_checks = 0
+        self.trigram_hits = 0
+        self.trigram_seconds = 0.0
+        self.embeddings = 0
+        self.embedding_seconds = 0.0
+
+    def record_lookup(self, seconds: float, hit: bool):
+        """In-memory exact lookup (every question)."""
+        with self._lock:
+            self.checks += 1
+            self.lookup_seconds += seconds
+            self.exact_hits += int(hit)
+
+    def record_trigram(self, seconds: float, hit: bool):
+        """pg_trgm round trip (exact misses of LEXICAL_TRGM_MIN_CHARS or more)."""
+        with self._lock:
+            self.trigram_checks += 1
+            self.trigram_seconds += seconds
+            self.trigram_hits += int(hit)
+
+    def record_embedding(self, seconds: float):
+        """Query-embedding latency on the slow path: what a hit avoids."""
+        with self._lock:
+            self.embeddings += 1
+            self.embedding_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.trigram_hits
+            trigram_misses = self.trigram_checks - self.trigram_hits
+            avg_lookup = self.lookup_seconds / self.checks if self.checks else 0.0
+            avg_trigram = self.trigram_seconds / self.trigram_checks if self.trigram_checks else 0.0
+            avg_embedding = self.embedding_seconds / self.embeddings if self.embeddings else 0.0
+            return {
+                "checks": self.checks,
+                "exact_hits": self.exact_hits,
+                "trigram_checks": self.trigram_checks,
+                "trigram_hits": self.trigram_hits,
+                "hit_rate": hits / self.checks if self.checks else 0.0,
+                "avg_lookup_ms": round(1000 * avg_lookup, 3),
+                "avg_trigram_ms": round(1000 * avg_trigram, 3),
+                "trigram_ms_total": round(1000 * self.trigram_seconds, 1),
+                "avg_embedding_ms": round(1000 * avg_embedding, 3),
+                # every hit skips the embedding call and the vector search
+                "est_exact_saved_ms_total": round(
+                    1000 * self.exact_hits * max(avg_embedding - avg_lookup, 0.0), 1
+                ),
+                # trigram hits save the embedding minus their own round trip;
+                # misses pay the round trip on top of the embedding
+                "est_trigram_saved_ms_total": round(
+                    1000 * (self.trigram_hits * (avg_embedding - avg_trigram) - trigram_misses * avg_trigram), 1
+                ),
+            }
+
+
+lexical_stats = LexicalStats()
+
+_trigram_available = True
+
+
+def _trigram_query(conn, question: str):
+    # strict threshold lets the GIN index do the filtering
+    conn.execute(
+        text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"),
+        {"t": str(settings.LEXICAL_TRGM_THRESHOLD)}
+    )
+    return conn.execute(
+        text("""
+            SELECT
+                f.canonical_question,
+                fq.question_text,
+                f.answer_en,
+                similarity(fq.question_text, :q) AS score
+            FROM faq_questions fq
+            JOIN faqs f ON f.id = fq.faq_id
+            WHERE fq.question_text % :q
+            ORDER BY score DESC
+            LIMIT 1
+        """),
+        {"q": question}
+    ).mappings().first()
+
+
+def _trigram_match(question: str, db) -> dict | None:
+    global _trigram_available
+
+    try:
+        # Request connection, inside a savepoint: a failure must not
+        # abort the request transaction
+        with db.begin_nested():
+            row = _trigram_query(db.connection(), question)
+    except ProgrammingError:
+        # pg_trgm migration not applied; don't retry on every request
+        _trigram_available = False
+        logger.warning("pg_trgm unavailable — lexical FAQ fast path is exact-match only")
+        return None
+    except Exception as e:
+        logger.warning("Trigram FAQ lookup failed: %s", e)
+        return None
+
+    if not row:
+        return None
+    return {
+        "question": row["canonical_question"],
+        "matched_variant": row["question_text"],
+        "answer": row["answer_en"],
+        "confidence": float(row["score"]),
+    }
+
+
+def exact_faq_match(question: str) -> dict | None:
+    """
+    Exact match on the normalized text (in-memory FAQ index, no I/O).
+    Returns {question, matched_variant, answer, confidence, match} or None.
+    """
+    if not settings.LEXICAL_FAQ_ENABLED:
+        return None
+
+    start = time.perf_counter()
+    row = faq_index.lookup_exact(question)
+    lexical_stats.record_lookup(time.perf_counter() - start, row is not None)
+    if not row:
+        return None
+    return {
+        "question": row["question"],
+        "matched_variant": row["matched_variant"],
+        "answer": row["answer"],
+        "confidence": 1.0,
+        "match": "exact",
+    }
+
+
+def trigram_faq_match(question: str, db) -> dict | None:
+    """
+    pg_trgm similarity >= LEXICAL_TRGM_THRESHOLD, one round trip on the
+    request connection. Runs on exact misses, before the query embedding
+    is requested: a hit skips the embedding call and the vector search.
+    """
+    if (
+        not settings.LEXICAL_FAQ_ENABLED
+        or not _trigram_available
+        or len(normalize_question(question)) < settings.LEXICAL_TRGM_MIN_CHARS
+    ):
+        return None
+
+    start = time.perf_counter()
+    result = _trigram_match(question, db)
+    lexical_stats.record_trigram(time.perf_counter() - start, result is not None)
+    if result:
+        result["match"] = "trigram"
+    return result
+
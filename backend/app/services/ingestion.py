@@ -1,51 +1,91 @@
+from itertools import chain
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from app.db.models.document import Document
+from app.core.config import settings
 from app.db.models.document_chunk import DocumentChunk
-from app.services.embeddings import get_embedding
-from app.services.text_extraction import extract_text
-from app.services.chunking import chunk_text
+from app.services.embeddings import get_embeddings
+from app.services.chunking import iter_chunks
 from app.services.text_cleaning import clean_text
+from app.services.text_extraction import UnreadableDocument
 
 
-def ingest_document(file, db: Session):
-    filename = file.filename
-    source_type = filename.split(".")[-1].lower()
+def add_chunk_batch(db: Session, document_id, indexed_chunks: list[tuple[int, str]]):
+    """
+    Embeds (idx, chunk) pairs in one batched call and inserts the rows.
+    Positions that already exist are left alone (ON CONFLICT DO NOTHING),
+    so a chunk is never stored twice. Caller commits.
+    """
+    indexed = [(idx, chunk) for idx, chunk in indexed_chunks if chunk.strip()]
+    if not indexed:
+        return
+    embeddings = get_embeddings([chunk for _, chunk in indexed])
 
-    # 1️⃣ Extract + clean text
-    raw_text = extract_text(file)
-    text = clean_text(raw_text)
+    db.execute(
+        pg_insert(DocumentChunk).on_conflict_do_nothing(index_elements=["document_id", "chunk_index"]),
+        [
+            {"document_id": document_id, "chunk_index": idx, "content": chunk, "embedding": emb}
+            for (idx, chunk), emb in zip(indexed, embeddings)
+        ]
+    )
 
-    if not text:
-        raise ValueError("Empty document extracted")
 
-    # 2️⃣ Save cleaned text
-    document = Document(
-        title=filename,
-        source_type=source_type,
-        final_text=text
-    )
-    db.add(document)
-    db.commit()
-    db.refresh(document)
-
-    # 3️⃣ Chunk cleaned text
-    chunks = chunk_text(text)
-
-    # 4️⃣ Embed + store
-    for idx, chunk in enumerate(chunks):
-        if chunk.strip():
-            emb = get_embedding(chunk)
-            db.add(DocumentChunk(
-                document_id=document.id,
-                chunk_index=idx,
-                content=chunk,
-                embedding=emb
-            ))
-
-    db.commit()
-
-    return {
-        "id": document.id,
-        "title": filename,
-        "chunks": len(chunks)
-    }
+# -------------------- Streaming pipeline --------------------
+def clean_words(pages: Iterable[str], parts: list[str]) -> Iterator[str]:
+    """
+    Cleans page by page and yields words. Cleaned pages are collected in
+    `parts`; " ".join(parts) equals clean_text of the whole document.
+    """
+    for page in pages:
+        cleaned = clean_text(page)
+        if cleaned:
+            parts.append(cleaned)
+            yield from cleaned.split()
+
+
+def open_word_stream(pages: Iterable[str], parts: list[str]) -> Iterator[str]:
+    """Starts the stream; raises before anything is written if it is empty."""
+    words = clean_words(pages, parts)
+    first = next(words, None)
+    if first is None:
+        raise UnreadableDocument("Empty document extracted")
+    return chain([first], words)
+
+
+def embed_chunk_stream(
+    db: Session,
+    document_id,
+    words: Iterable[str],
+    skip: int = 0,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """
+    Chunks the word stream and embeds + inserts it INGESTION_BATCH_SIZE
+    chunks at a time, one commit per batch. Chunks below `skip` are
+    already stored (resume) and are not re-embedded. `on_batch(done)`
+    runs before each commit. Returns the total chunk count.
+    """
+    batch_size = settings.INGESTION_BATCH_SIZE
+    batch = []
+    total = 0
+
+    def flush():
+        add_chunk_batch(db, document_id, batch)
+        if on_batch:
+            on_batch(batch[-1][0] + 1)
+        db.commit()
+        batch.clear()
+
+    for idx, chunk in enumerate(iter_chunks(words)):
+        total = idx + 1
+        if idx < skip:
+            continue
+        batch.append((idx, chunk))
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+    return total
+
@@ -0,0 +1,393 @@
+import io
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Iterable
+
+from sqlalchemy import case, delete, func, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.db.models.document import Document
+from app.db.models.document_chunk import DocumentChunk
+from app.db.models.ingestion_job import IngestionJob
+from app.services.ingestion import open_word_stream, embed_chunk_stream
+from app.services.text_extraction import UnreadableDocument, iter_pages
+from app.services.answer_cache import answer_cache
+
+logger = logging.getLogger("campusconnect")
+
+
+# -------------------- Enqueue --------------------
+def enqueue_ingestion(db: Session, filename: str, data: bytes) -> IngestionJob:
+    job = IngestionJob(
+        filename=filename,
+        source_type=filename.split(".")[-1].lower(),
+        payload=data,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    ingestion_workers.wake()
+    return job
+
+
+def job_status(job: IngestionJob) -> dict:
+    # The chunk total is only known once the stream has been fully
+    # chunked; until then progress is measured in source pages, which
+    # are counted before extraction starts
+    chunks_total = job.chunks_total if job.status == "done" else None
+    if chunks_total:
+        percent = round(100 * job.chunks_done / chunks_total, 1)
+    elif job.pages_total:
+        percent = round(100 * min(job.pages_done, job.pages_total) / job.pages_total, 1)
+    else:
+        percent = None
+
+    return {
+        "job_id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": {
+            "pages_done": job.pages_done,
+            "pages_total": job.pages_total,
+            "chunks_done": job.chunks_done,
+            "chunks_total": chunks_total,
+            "percent": percent,
+        },
+        "attempts": job.attempts,
+        "error": job.error,
+        "document_id": job.document_id,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+
+
+# -------------------- Claim --------------------
+def claim_next_job(db: Session):
+    """
+    Atomically moves the oldest runnable job to 'running' under a fresh
+    lease token; returns (job_id, lease_token) or None.
+    SKIP LOCKED lets any number of workers (and processes) poll safely.
+    Jobs whose heartbeat stopped for INGESTION_STALE_SECONDS (crashed
+    worker) are picked up again while attempts remain, else failed.
+    """
+    abandoned = db.execute(
+        text("""
+            UPDATE ingestion_jobs
+            SET status = 'failed',
+                lease_token = NULL,
+                chunks_done = 0,
+                error = 'Worker stopped responding (no heartbeat)',
+                updated_at = now()
+            WHERE status = 'running'
+              AND updated_at < now() - make_interval(secs => :stale)
+              AND attempts >= :max_attempts
+            RETURNING document_id
+        """),
+        {"stale": settings.INGESTION_STALE_SECONDS, "max_attempts": settings.INGESTION_MAX_ATTEMPTS}
+    ).scalars().all()
+    _discard_documents(db, abandoned)
+
+    row = db.execute(
+        text("""
+            UPDATE ingestion_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                lease_token = :lease,
+                pages_done = 0,
+                pages_total = NULL,
+                error = NULL,
+                updated_at = now()
+            WHERE id = (
+                SELECT id FROM ingestion_jobs
+                WHERE status = 'queued'
+                   OR (status = 'running'
+                       AND updated_at < now() - make_interval(secs => :stale)
+                       AND attempts < :max_attempts)
+                ORDER BY created_at
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING id, lease_token
+        """),
+        {
+            "lease": uuid.uuid4(),
+            "stale": settings.INGESTION_STALE_SECONDS,
+            "max_attempts": settings.INGESTION_MAX_ATTEMPTS,
+        }
+    ).first()
+    db.commit()
+    return (row[0], row[1]) if row else None
+
+
+def _discard_documents(db: Session, document_ids):
+    """
+    Deletes the partial documents of failed jobs. Their chunks go with
+    them (ON DELETE CASCADE), so retrieval stops serving them, and the
+    jobs' document_id is cleared (SET NULL). Caller commits.
+    """
+    document_ids = [d for d in document_ids if d is not None]
+    if not document_ids:
+        return
+    db.execute(delete(Document).where(Document.id.in_(document_ids)))
+    answer_cache.invalidate()  # answers may have been built from those chunks
+
+
+# -------------------- Lease --------------------
+class LeaseLost(Exception):
+    """The job was reclaimed by another worker; stop without writing."""
+
+
+class JobLease:
+    """
+    Ownership of a claimed job. A heartbeat thread renews it on its own
+    connection every INGESTION_HEARTBEAT_SECONDS, so long extraction/OCR
+    phases don't look stale, and reports page progress while it does.
+    Every progress write goes through checkpoint(), which only matches
+    while the token is still ours: a worker that lost its job can't
+    commit anything for it.
+    """
+
+    def __init__(self, job_id, token):
+        self.job_id = job_id
+        self.token = token
+        self.pages_done = 0
+        self.pages_total = None
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"lease-{job_id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(5)
+
+    def _beat(self):
+        while not self._stop.wait(settings.INGESTION_HEARTBEAT_SECONDS):
+            try:
+                with engine.begin() as conn:
+                    renewed = conn.execute(
+                        update(IngestionJob)
+                        .where(IngestionJob.id == self.job_id, IngestionJob.lease_token == self.token)
+                        .values(
+                            updated_at=func.now(),
+                            pages_done=self.pages_done,
+                            pages_total=self.pages_total,
+                        )
+                    ).rowcount
+            except Exception as e:
+                logger.warning("Ingestion heartbeat for %s failed: %s", self.job_id, e)
+                continue
+            if not renewed:
+                self.lost.set()
+                return
+
+    def check(self):
+        if self.lost.is_set():
+            raise LeaseLost()
+
+    def checkpoint(self, db: Session, **values):
+        """Stages a job update in the caller's transaction; raises LeaseLost if not ours."""
+        self.check()
+        matched = db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == self.job_id, IngestionJob.lease_token == self.token)
+            .values(
+                updated_at=func.now(),
+                pages_done=self.pages_done,
+                pages_total=self.pages_total,
+                **values
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not matched:
+            self.lost.set()
+            raise LeaseLost()
+
+    def set_pages_total(self, total: int):
+        self.pages_total = total
+
+    def track(self, pages: Iterable[str]):
+        """Passes pages through, counting them; stops early once the lease is lost."""
+        for page in pages:
+            self.check()
+            self.pages_done += 1
+            yield page
+
+
+# -------------------- Run --------------------
+def run_job(db: Session, job_id, lease_token):
+    """
+    extract → clean → chunk → embed → insert as one streaming pass, resumable.
+
+    Idempotency:
+    - the Document row is created once and linked to the job in the same
+      commit; a retry re-reads the stored upload into the same document
+    - each batch of chunks is inserted in the same commit that advances
+      chunks_done, so a retry skips (without re-embedding) everything up
+      to chunks_done
+    - every commit is conditional on the lease, and chunk positions are
+      unique, so a chunk is never inserted twice even if a live job is
+      reclaimed
+
+    The extracted text is not checkpointed: a retry re-extracts (and
+    re-OCRs) the whole stored upload and only skips embedding/inserting
+    the first chunks_done chunks.
+
+    Failure: UnreadableDocument (corrupt file, bad encoding, no text)
+    fails the job at once; anything else is retried while attempts
+    remain. A job that ends up failed has its partial document deleted.
+    """
+    job = db.get(IngestionJob, job_id)
+    lease = JobLease(job_id, lease_token)
+    lease.start()
+
+    try:
+        # 1️⃣ Extract + clean lazily
+        lease.checkpoint(db, stage="extracting")
+        db.commit()
+        upload = SimpleNamespace(filename=job.filename, file=io.BytesIO(job.payload or b""))
+        parts = []
+        words = open_word_stream(lease.track(iter_pages(upload, lease.set_pages_total)), parts)
+
+        document_id = job.document_id
+        if document_id is None:
+            document = Document(
+                title=job.filename,
+                source_type=job.source_type,
+                final_text=""
+            )
+            db.add(document)
+            db.flush()
+            document_id = document.id
+            lease.checkpoint(db, document_id=document_id)
+            db.commit()
+        chunks_done = job.chunks_done
+
+        # Nothing past chunks_done can have been committed by a lease
+        # holder, but clear it anyway before resuming
+        db.execute(
+            delete(DocumentChunk).where(
+                DocumentChunk.document_id == document_id,
+                DocumentChunk.chunk_index >= chunks_done
+            )
+        )
+        lease.checkpoint(db, stage="embedding")
+        db.commit()
+
+        # 2️⃣ Chunk + embed + insert, one commit per batch
+        def progress(done):
+            lease.checkpoint(db, chunks_done=done)
+
+        total = embed_chunk_stream(db, document_id, words, skip=chunks_done, on_batch=progress)
+
+        # 3️⃣ Done
+        db.execute(
+            update(Document).where(Document.id == document_id).values(final_text=" ".join(parts))
+        )
+        lease.checkpoint(
+            db,
+            chunks_total=total,
+            chunks_done=total,
+            status="done",
+            stage="done",
+            payload=None,
+            lease_token=None,
+            finished_at=datetime.now(timezone.utc),
+        )
+        db.commit()
+        answer_cache.invalidate()
+
+    except LeaseLost:
+        db.rollback()
+        logger.warning("Ingestion job %s was reclaimed by another worker; stopping", job_id)
+
+    except Exception as e:
+        db.rollback()
+        # only the lease holder decides retry vs failed; retrying won't
+        # make an unreadable upload readable
+        if isinstance(e, UnreadableDocument):
+            status = "failed"
+        else:
+            status = case(
+                (IngestionJob.attempts < settings.INGESTION_MAX_ATTEMPTS, "queued"),
+                else_="failed"
+            )
+        failed = db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == job_id, IngestionJob.lease_token == lease_token)
+            .values(
+                status=status,
+                lease_token=None,
+                error=str(e),
+                updated_at=func.now(),
+            )
+            .returning(IngestionJob.status, IngestionJob.document_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if failed and failed.status == "failed":
+            db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id == job_id)
+                .values(chunks_done=0)
+                .execution_options(synchronize_session=False)
+            )
+            _discard_documents(db, [failed.document_id])
+        db.commit()
+        logger.exception("Ingestion job %s failed", job_id)
+
+    finally:
+        lease.stop()
+
+
+# -------------------- Worker pool --------------------
+class IngestionWorkerPool:
+    """Background threads that claim and run ingestion jobs."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self, workers: int):
+        for i in range(workers):
+            t = threading.Thread(target=self._loop, name=f"ingestion-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                claimed = claim_next_job(db)
+                if claimed is not None:
+                    run_job(db, *claimed)
+                    continue
+            except Exception:
+                logger.exception("Ingestion worker error")
+            finally:
+                db.close()
+
+            self._wake.wait(settings.INGESTION_POLL_SECONDS)
+            self._wake.clear()
+
+
+ingestion_workers = IngestionWorkerPool()
@@ -1,18 +1,21 @@
+import re
+import threading
+from functools import lru_cache
+
 from langdetect import detect, DetectorFactory
+from langdetect.detector_factory import init_factory
+
+from app.core.config import settings
+
 # Ensure deterministic results
 DetectorFactory.seed = 0
-def detect_language(text: str) -> str:
-    try:
-        return detect(text)
-    except:
-        return "en"
-
 
-import re
 INDIC_KEYWORDS = {
     "kya", "hai", "ka", "ki", "ke",
     "fees", "hostel", "admission"
 }
+
+
 def looks_romanized_indic(text: str) -> bool:
     tokens = re.findall(r"\w+", text.lower())
     overlap = len(set(tokens) & INDIC_KEYWORDS)
@@ -22,3 +25,87 @@ def looks_romanized_indic(text: str) -> bool:
     if overlap / max(len(tokens), 1) >= 0.3:
         return True
     return False
+
+
+# Function words: one of these and none of NON_ENGLISH_WORDS → clearly English
+ENGLISH_WORDS = {
+    "the", "is", "are", "was", "be", "do", "does", "did", "can", "could",
+    "will", "would", "should", "i", "my", "me", "we", "our", "you", "your",
+    "it", "to", "of", "for", "and", "or", "in", "on", "at", "from", "with",
+    "what", "when", "where", "which", "who", "why", "how", "there", "this",
+    "that", "an", "have", "has", "am", "not", "any", "after", "before",
+}
+
+# Common French / Spanish / German / Italian / Portuguese / Dutch function
+# words that are not also English words
+NON_ENGLISH_WORDS = {
+    "le", "la", "les", "des", "du", "est", "et", "quand", "comment", "pour", "une",
+    "el", "los", "las", "es", "y", "cuando", "como", "donde", "que", "por", "una", "del",
+    "der", "das", "und", "ist", "wann", "wie", "wo", "ich", "ein", "eine", "mit",
+    "il", "di", "che", "quando", "dove", "sono",
+    "o", "os", "em", "um", "uma", "onde", "nao",
+    "het", "een", "van", "ik", "wat",
+}
+
+
+def looks_english(text: str) -> bool:
+    tokens = set(re.findall(r"[a-z]+", text.lower()))
+    return bool(tokens & ENGLISH_WORDS) and not tokens & NON_ENGLISH_WORDS
+
+
+_stats_lock = threading.Lock()
+_fast_path = 0
+_classified = 0
+
+
+@lru_cache(maxsize=settings.LANG_CACHE_SIZE)
+def _classify(text: str) -> str:
+    global _classified
+    with _stats_lock:
+        _classified += 1
+    try:
+        return detect(text)
+    except Exception:
+        return "en"
+
+
+def detect_language(text: str) -> str:
+    """
+    ISO 639-1 code of `text`, "en" when undetectable.
+    Short pure-ASCII questions that are clearly English (an English
+    function word, no French/Spanish/German/... one, no romanized-Indic
+    signal) skip the classifier. Everything else, including ASCII
+    Latin-script questions in other languages and bare keywords, is
+    classified once and memoized.
+    """
+    global _fast_path
+    text = text.strip()
+
+    # ⚡ short-circuit: no classifier for plain short English
+    if (
+        len(text) <= settings.LANG_FAST_PATH_MAX_CHARS
+        and text.isascii()
+        and looks_english(text)
+        and not looks_romanized_indic(text)
+    ):
+        with _stats_lock:
+            _fast_path += 1
+        return "en"
+
+    return _classify(text)
+
+
+def warm_up():
+    """Loads the language profiles now instead of on the first request."""
+    init_factory()
+
+
+def stats() -> dict:
+    info = _classify.cache_info()
+    return {
+        "fast_path": _fast_path,
+        "classified": _classified,
+        "cache_hits": info.hits,
+        "cache_size": info.currsize,
+        "cache_max": info.maxsize,
+    }
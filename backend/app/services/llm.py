@@ -1,14 +1,68 @@
-from openai import OpenAI
+import anyio
+from openai import OpenAI, AsyncOpenAI
 from app.core.config import settings
+from app.core.limiter import llm_gate
+from app.services.prompt import prompt_stats
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+async_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+
+
+def _as_messages(messages):
+    # a plain string is sent as one user turn; build_prompt returns a message list
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return messages
 
 
 def generate_answer(messages):
+    # Not behind llm_gate (async only): used by the sync answer_question,
+    # which no route serves
     response = client.chat.completions.create(
         model="gpt-4o-mini",
-        messages=messages,
+        messages=_as_messages(messages),
         temperature=0.3
     )
+    prompt_stats.record_usage(response.usage)
 
     return response.choices[0].message.content
+
+
+async def agenerate_answer(messages):
+    # Raises LLMOverloaded when no slot frees up in time
+    async with llm_gate.slot():
+        response = await async_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_as_messages(messages),
+            temperature=0.3
+        )
+    prompt_stats.record_usage(response.usage)
+
+    return response.choices[0].message.content
+
+
+async def astream_answer(messages):
+    """
+    Yields answer text deltas as they arrive.
+    The upstream stream is always closed, including when the consumer
+    stops early (client disconnect → task cancellation).
+    The LLM slot is held until the stream is finished.
+    """
+    async with llm_gate.slot():
+        stream = await async_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_as_messages(messages),
+            temperature=0.3,
+            stream=True,
+            stream_options={"include_usage": True}  # usage arrives in a final, choice-less chunk
+        )
+
+        try:
+            async for chunk in stream:
+                if chunk.usage:
+                    prompt_stats.record_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            with anyio.CancelScope(shield=True):
+                await stream.close()
@@ -1,94 +1,185 @@
+import threading
+
+from app.core.config import settings
+from app.services.tokens import MESSAGE_OVERHEAD, count_tokens, truncate_tokens
+
+# -------------------- STATIC SYSTEM BLOCK --------------------
+# Sent first and byte-identical on every request, so the provider can
+# reuse it as a cached prompt prefix. Nothing request-specific goes here.
+SYSTEM_PROMPT = (
+    "You are CampusConnect AI, an official university assistant.\n"
+    "Rules:\n"
+    "- Answer ONLY using the provided information.\n"
+    "- Do NOT invent facts.\n"
+    "- If information is missing, say you are not sure.\n"
+    "- Be clear, concise, and helpful.\n"
+    "\n"
+    "The last user message contains the information to use, under these headings:\n"
+    "- FAQ MATCH (AUTHORITATIVE): if present, return ONLY that answer, exactly. "
+    "Do NOT add extra details or contradict it.\n"
+    "- DOCUMENT CONTEXT: otherwise, answer strictly based on the document content. "
+    "If the documents do not fully answer, say so.\n"
+    "- USER QUESTION: the question to answer.\n"
+    "Earlier messages are the recent conversation, for context only.\n"
+    "If neither an FAQ answer nor the documents are sufficient, say you are not sure.\n"
+    "Do NOT mention FAQs, documents, embeddings, or confidence scores.\n"
+    "Respond in the language named in the user message, if one is given.\n"
+)
+
+_SYSTEM_TOKENS = None
+
+
+class PromptStats:
+    """Tokens sent per LLM request: local count at assembly, provider usage after."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompts = 0
+        self.tokens = 0
+        self.max_tokens = 0
+        self.chunks_truncated = 0
+        self.chunks_dropped = 0
+        self.history_dropped = 0
+        self.usage_reports = 0
+        self.provider_prompt_tokens = 0
+        self.provider_cached_tokens = 0
+        self.completion_tokens = 0
+
+    def record_prompt(self, tokens: int, truncated: int, dropped: int, history_dropped: int):
+        with self._lock:
+            self.prompts += 1
+            self.tokens += tokens
+            self.max_tokens = max(self.max_tokens, tokens)
+            self.chunks_truncated += truncated
+            self.chunks_dropped += dropped
+            self.history_dropped += history_dropped
+
+    def record_usage(self, usage):
+        """`usage` from a chat completion response (may be None)."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self.usage_reports += 1
+            self.provider_prompt_tokens += usage.prompt_tokens or 0
+            self.provider_cached_tokens += getattr(details, "cached_tokens", 0) or 0
+            self.completion_tokens += usage.completion_tokens or 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "prompts": self.prompts,
+                "avg_tokens": round(self.tokens / self.prompts, 1) if self.prompts else 0.0,
+                "max_tokens": self.max_tokens,
+                "budget_tokens": settings.PROMPT_MAX_TOKENS,
+                "chunks_truncated": self.chunks_truncated,
+                "chunks_dropped": self.chunks_dropped,
+                "history_dropped": self.history_dropped,
+                "provider_prompt_tokens": self.provider_prompt_tokens,
+                "provider_cached_tokens": self.provider_cached_tokens,
+                "provider_cached_ratio": (
+                    self.provider_cached_tokens / self.provider_prompt_tokens
+                    if self.provider_prompt_tokens else 0.0
+                ),
+                "avg_completion_tokens": (
+                    round(self.completion_tokens / self.usage_reports, 1) if self.usage_reports else 0.0
+                ),
+            }
+
+
+prompt_stats = PromptStats()
+
+
+def _system_tokens() -> int:
+    global _SYSTEM_TOKENS
+    if _SYSTEM_TOKENS is None:
+        _SYSTEM_TOKENS = MESSAGE_OVERHEAD + count_tokens(SYSTEM_PROMPT)
+    return _SYSTEM_TOKENS
+
+
 def build_prompt(
     question: str,
     chat_history: list[dict] | None = None,
     faq: dict | None = None,
     doc_context: list[dict] | None = None,
     lang: str = "en",
-) -> str:
+) -> list[dict]:
     """
-    Builds a safe, grounded prompt for the LLM.
-    Priority:
-    1. FAQ answer (authoritative)
-    2. Document context
-    3. Conversation history
+    Builds a safe, grounded chat message list for the LLM:
+      [static system block] + [recent conversation] + [context + question]
+    Packed against PROMPT_MAX_TOKENS. Priority:
+    1. FAQ answer (authoritative, never trimmed)
+    2. Document context (each chunk capped, lowest-ranked dropped first)
+    3. Conversation history (newest kept first, own cap)
     """
+    budget = settings.PROMPT_MAX_TOKENS
 
-    # -------------------- SYSTEM ROLE --------------------
-    system_prompt = (
-        "You are CampusConnect AI, an official university assistant.\n"
-        "Rules:\n"
-        "- Answer ONLY using the provided information.\n"
-        "- Do NOT invent facts.\n"
-        "- If information is missing, say you are not sure.\n"
-        "- Be clear, concise, and helpful.\n"
-    )
-
+    # -------------------- USER QUESTION (always sent) --------------------
+    tail = f"### USER QUESTION\n{question}\n"
     if lang != "en":
-        system_prompt += (
-            f"- Respond in {lang}.\n"
-        )
+        tail += f"\nRespond in {lang}.\n"
+
+    used = _system_tokens() + 2 * MESSAGE_OVERHEAD + count_tokens(tail)
 
     # -------------------- FAQ CONTEXT --------------------
-    faq_block = ""
+    blocks = []
     if faq:
         faq_block = (
             "### FAQ MATCH (AUTHORITATIVE)\n"
             f"Canonical Question: {faq.get('question')}\n"
             f"Matched Variant: {faq.get('matched_variant')}\n"
-            f"Answer:\n{faq.get('answer')}\n\n"
-            "IMPORTANT:\n"
-            "- Use the FAQ answer EXACTLY.\n"
-            "- Do NOT add extra details.\n"
-            "- Do NOT contradict the FAQ.\n"
+            f"Answer:\n{faq.get('answer')}\n"
         )
+        blocks.append(faq_block)
+        used += count_tokens(faq_block)
 
     # -------------------- DOCUMENT CONTEXT --------------------
-    docs_block = ""
+    truncated = dropped = 0
     if doc_context:
         docs_block = "### DOCUMENT CONTEXT\n"
+        # the header is only sent (and counted) with at least one entry
+        header_tokens = count_tokens(docs_block)
+        entries = []
+
         for i, doc in enumerate(doc_context, start=1):
-            docs_block += (
-                f"[Document {i}]\n"
-                f"{doc.get('content')}\n\n"
-            )
-
-        docs_block += (
-            "IMPORTANT:\n"
-            "- Answer strictly based on the document content above.\n"
-            "- If documents do not fully answer, say so.\n"
-        )
+            content = doc.get("content") or ""
+            clipped = truncate_tokens(content, settings.PROMPT_CHUNK_MAX_TOKENS)
+            entry = f"[Document {i}]\n{clipped}\n\n"
+            tokens = count_tokens(entry) + (0 if entries else header_tokens)
+            if used + tokens > budget:
+                dropped += len(doc_context) - i + 1
+                break
+            truncated += clipped != content
+            entries.append(entry)
+            used += tokens
+
+        if entries:
+            blocks.append(docs_block + "".join(entries))
 
     # -------------------- CHAT HISTORY --------------------
-    history_block = ""
-    if chat_history:
-        history_block = "### RECENT CONVERSATION\n"
-        for msg in chat_history:
-            role = msg.get("role", "user").capitalize()
-            history_block += f"{role}: {msg.get('content')}\n"
-
-    # -------------------- USER QUESTION --------------------
-    question_block = (
-        "### USER QUESTION\n"
-        f"{question}\n"
-    )
-
-    # -------------------- FINAL INSTRUCTIONS --------------------
-    answer_instruction = (
-        "### INSTRUCTIONS\n"
-        "- If an FAQ answer is provided, return ONLY that answer.\n"
-        "- Otherwise, use the document context.\n"
-        "- If neither is sufficient, say you are not sure.\n"
-        "- Do NOT mention FAQs, documents, embeddings, or confidence scores.\n"
-    )
-
-    # -------------------- BUILD FINAL PROMPT --------------------
-    prompt = (
-        system_prompt + "\n\n" +
-        faq_block + "\n\n" +
-        docs_block + "\n\n" +
-        history_block + "\n\n" +
-        question_block + "\n\n" +
-        answer_instruction
-    )
-
-    return prompt.strip()
+    history = []
+    history_used = 0
+    history_dropped = 0
+    for msg in reversed(chat_history or []):
+        role = msg.get("role", "user")
+        content = msg.get("content") or ""
+        tokens = MESSAGE_OVERHEAD + count_tokens(content)
+        if (
+            history_used + tokens > settings.PROMPT_HISTORY_MAX_TOKENS
+            or used + history_used + tokens > budget
+        ):
+            history_dropped = len(chat_history) - len(history)
+            break
+        history.append({"role": "assistant" if role == "assistant" else "user", "content": content})
+        history_used += tokens
+    history.reverse()
+
+    # -------------------- BUILD MESSAGES --------------------
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        *history,
+        {"role": "user", "content": "\n".join(blocks + [tail])},
+    ]
+
+    prompt_stats.record_prompt(used + history_used, truncated, dropped, history_dropped)
+    return messages
@@ -1,32 +1,181 @@
-from app.services.chat_store import save_message
-from app.services.escalation import create_escalation
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import anyio
+from fastapi.concurrency import run_in_threadpool
+from app.services.chat_store import ConversationTurn, persist_turn
 from app.services.chat_history import get_recent_messages
 from app.services.language import detect_language
-from app.services.embeddings import get_embedding
-from app.services.retrieval import retrieve_faqs
+from app.services.embeddings import get_embedding, aget_embedding
+from app.services.retrieval import retrieve_faqs, retrieve_faqs_and_documents
 from app.services.doc_retrieval import retrieve_documents
 from app.services.prompt import build_prompt
-from app.services.llm import generate_answer
+from app.services.llm import generate_answer, agenerate_answer, astream_answer
+from app.services.answer_cache import answer_cache
+from app.services.faq_index import faq_index
+from app.services.faq_lexical import exact_faq_match, lexical_stats, trigram_faq_match
+from app.services.single_flight import embedding_flight, llm_flight
+from app.services.text_cleaning import normalize_question
 
+logger = logging.getLogger("campusconnect")
 
 FAQ_THRESHOLD = 0.45
 DOC_THRESHOLD = 0.95   # more relaxed since PDFs vary
 
+ESCALATION_ANSWER = (
+    "I’m not fully sure about this yet. "
+    "Your question has been forwarded to the university administration. "
+    "You will get a verified response soon."
+)
+
+
+def _history_dicts(messages) -> list[dict]:
+    return [{"role": m.role, "content": m.content} for m in messages]
+
+
+def _cached_result(cached: dict) -> dict:
+    return {
+        "source": "documents+llm",
+        "answer": cached["answer"],
+        "confidence": cached["confidence"],
+        "escalated": False
+    }
+
+
+def _lexical_result(match: dict) -> dict:
+    return {
+        "source": "faq",
+        "answer": match["answer"],
+        "confidence": match["confidence"],
+        "escalated": False
+    }
+
+
+def _faq_decisive(faqs) -> bool:
+    return bool(faqs) and faqs[0]["distance"] <= FAQ_THRESHOLD
+
+
+def _retrieve(query_emb, db):
+    """
+    FAQ candidates, plus document chunks unless the FAQ result is decisive.
+    At most one DB round trip: FAQs come from the in-memory index when it
+    is loaded, otherwise FAQs and documents come from one combined query.
+    """
+    if faq_index.ready:
+        faqs = retrieve_faqs(query_emb)
+        if _faq_decisive(faqs):
+            return faqs, []
+        return faqs, retrieve_documents(query_emb, db=db)
+    return retrieve_faqs_and_documents(query_emb, db=db)
+
+
+def _history_digest(chat_history) -> str | None:
+    if not chat_history:
+        return None
+    raw = json.dumps([(m["role"], m["content"]) for m in chat_history], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _answer_key(question: str, lang: str, doc_context, chat_history) -> tuple:
+    # The prompt carries the session's history: only identical
+    # conversations (in practice, fresh sessions) share an LLM call
+    return (
+        normalize_question(question),
+        lang,
+        tuple((d["document_id"], d["chunk_index"]) for d in doc_context),
+        _history_digest(chat_history),
+    )
+
+
+def _cache_lookup(query_emb, lang: str, chat_history):
+    # Answers written for one conversation are never served to another,
+    # so the shared cache only holds (and serves) history-free answers
+    if chat_history:
+        return None
+    return answer_cache.lookup(query_emb, lang)
+
+
+def _cache_store(query_emb, lang: str, chat_history, answer: str, confidence: float, version: int):
+    if not chat_history:
+        answer_cache.store(query_emb, lang, answer, confidence, version)
+
+
+def _load_history(db, session_id) -> list[dict]:
+    # Request session: no second pooled connection per chat request.
+    # The current turn is only written at the end, so this never
+    # includes the question being answered.
+    return _history_dicts(get_recent_messages(db, session_id))
+
+
+def _persist(db, turn: ConversationTurn, result: dict | None = None) -> dict | None:
+    """Writes the staged turn (one commit) and fills in escalation_id."""
+    escalation_id = persist_turn(db, turn)
+    if result is not None and escalation_id is not None:
+        result["escalation_id"] = escalation_id
+    return result
+
+
+def _persist_after_error(db, turn: ConversationTurn):
+    # keep the student's question even if answering failed
+    try:
+        db.rollback()
+        persist_turn(db, turn)
+    except Exception:
+        logger.exception("Could not save chat turn after pipeline error")
+
+
+def _escalation_result() -> dict:
+    return {
+        "source": "escalation",
+        "answer": ESCALATION_ANSWER,
+        "confidence": 0.0,
+        "escalated": True
+    }
+
 
 def answer_question(db, question: str, session_id: str | None = None):
-    # ✍️ Save user message
-    save_message(db, session_id, "user", question)
+    """
+    Synchronous pipeline, kept as the benchmark baseline; routes use
+    answer_question_async / stream_answer. Its LLM call is not capped by
+    llm_gate.
+    """
+    # ✍️ Stage the turn; everything is written in one commit at the end
+    turn = ConversationTurn(session_id)
+    turn.add_message("user", question)
+
+    try:
+        result = _route(db, question, session_id, turn)
+    except Exception:
+        _persist_after_error(db, turn)
+        raise
+
+    return _persist(db, turn, result)
+
+
+def _route(db, question: str, session_id, turn: ConversationTurn) -> dict:
+    # ------------------ 0. LEXICAL FAQ FAST PATH (no embedding) ------------------
+    result = _exact_match(question, turn) or _trigram_result(db, question, turn)
+    if result:
+        return result
 
     lang = detect_language(question)
-    query_emb = get_embedding(question)
+    query_emb = embedding_flight.do(normalize_question(question), lambda: _timed_embedding_sync(question))
+
+    # FAQs from the in-memory index (documents fetched later, only if
+    # needed), or FAQs + documents together in one query
+    if faq_index.ready:
+        faqs, docs = retrieve_faqs(query_emb), None
+    else:
+        faqs, docs = retrieve_faqs_and_documents(query_emb, db=db)
 
     # ------------------ 1. FAQ MATCH ------------------
-    faqs = retrieve_faqs(query_emb)
     if faqs:
         best = faqs[0]
         if best["distance"] <= FAQ_THRESHOLD:
             answer = best["answer"]
-            save_message(db, session_id, "assistant", answer)
+            turn.add_message("assistant", answer)
             return {
                 "source": "faq",
                 "answer": answer,
@@ -34,8 +183,17 @@ def answer_question(db, question: str, session_id: str | None = None):
                 "escalated": False
             }
 
+    # ------------------ 2a. SEMANTIC ANSWER CACHE ------------------
+    cache_version = answer_cache.version
+    chat_history = _load_history(db, session_id)
+    cached = _cache_lookup(query_emb, lang, chat_history)
+    if cached:
+        turn.add_message("assistant", cached["answer"])
+        return _cached_result(cached)
+
     # ------------------ 2. DOCUMENT MATCH ------------------
-    docs = retrieve_documents(query_emb)
+    if docs is None:
+        docs = retrieve_documents(query_emb, db=db)
     doc_context = None
 
     if docs and docs[0]["distance"] <= DOC_THRESHOLD:
@@ -43,8 +201,6 @@ def answer_question(db, question: str, session_id: str | None = None):
         doc_context = docs[:3]
 
         # build prompt with documents
-        chat_history = get_recent_messages(db, session_id)
-
         prompt = build_prompt(
             question=question,
             chat_history=chat_history,
@@ -53,37 +209,285 @@ def answer_question(db, question: str, session_id: str | None = None):
             lang=lang
         )
 
-        answer = generate_answer(prompt)
-        save_message(db, session_id, "assistant", answer)
+        confidence = 1 - docs[0]["distance"]
+
+        def generate():
+            answer = generate_answer(prompt)
+            _cache_store(query_emb, lang, chat_history, answer, confidence, cache_version)
+            return answer
+
+        # 🤝 concurrent identical questions share one LLM call
+        answer = llm_flight.do(_answer_key(question, lang, doc_context, chat_history), generate)
+        turn.add_message("assistant", answer)
 
         return {
             "source": "documents+llm",
             "answer": answer,
-            "confidence": 1 - docs[0]["distance"],
+            "confidence": confidence,
             "escalated": False
         }
 
     # ------------------ 3. NO MATCH → ESCALATE ------------------
-    escalation = create_escalation(
-        db=db,
-        question=question,
-        bot_answer=None,
-        confidence=0.0,
-        session_id=session_id,
-    )
+    turn.escalate(question=question, bot_answer=None, confidence=0.0)
+    turn.add_message("assistant", ESCALATION_ANSWER)
+    return _escalation_result()
+
+
+def _timed_embedding_sync(question: str):
+    start = time.perf_counter()
+    query_emb = get_embedding(question)
+    lexical_stats.record_embedding(time.perf_counter() - start)
+    return query_emb
+
+
+async def _timed_embedding(question: str):
+    async def embed():
+        start = time.perf_counter()
+        query_emb = await aget_embedding(question)
+        lexical_stats.record_embedding(time.perf_counter() - start)
+        return query_emb
+
+    # 🤝 concurrent identical questions share one embedding request
+    return await embedding_flight.ado(normalize_question(question), embed)
+
+
+def _exact_match(question: str, turn: ConversationTurn):
+    """In-memory exact FAQ match; on a hit the answer is staged and the result returned."""
+    match = exact_faq_match(question)
+    if not match:
+        return None
+
+    turn.add_message("assistant", match["answer"])
+    return _lexical_result(match)
+
 
-    final_answer = (
-        "I’m not fully sure about this yet. "
-        "Your question has been forwarded to the university administration. "
-        "You will get a verified response soon."
+def _trigram_result(db, question: str, turn: ConversationTurn):
+    """
+    pg_trgm FAQ match on the request connection, before any embedding is
+    requested; on a hit the answer is staged and the result returned.
+    """
+    match = trigram_faq_match(question, db)
+    if not match:
+        return None
+
+    turn.add_message("assistant", match["answer"])
+    return _lexical_result(match)
+
+
+async def _lexical_async(db, question: str, turn: ConversationTurn):
+    """Exact match in memory; only on a miss a threadpool hop for the trigram lookup."""
+    return _exact_match(question, turn) or await run_in_threadpool(_trigram_result, db, question, turn)
+
+
+async def _prepare_async(db, question: str, session_id):
+    """
+    Runs everything up to the routing decision, overlapping independent
+    stages:
+      - language detection, history load and the query embedding all
+        run at once
+      - retrieval runs once the vector exists, in at most one DB round
+        trip (see _retrieve)
+    Blocking DB work runs in the threadpool; `db` is only ever used by
+    one thread at a time (the history load is the only DB stage in the
+    gather; the embedding cache uses its own short-lived connection).
+    """
+    # ------------------ 0. INDEPENDENT STAGES ------------------
+    lang, chat_history, query_emb = await asyncio.gather(
+        run_in_threadpool(detect_language, question),
+        run_in_threadpool(_load_history, db, session_id),
+        _timed_embedding(question),
     )
 
-    save_message(db, session_id, "assistant", final_answer)
+    # ------------------ 1+2. FAQ + DOCUMENT RETRIEVAL ------------------
+    # Reuses the request connection
+    faqs, docs = await run_in_threadpool(_retrieve, query_emb, db)
 
-    return {
-        "source": "escalation",
-        "answer": final_answer,
-        "confidence": 0.0,
-        "escalated": True,
-        "escalation_id": escalation.id
-    }
+    return lang, chat_history, faqs, docs, query_emb
+
+
+async def answer_question_async(db, question: str, session_id: str | None = None):
+    """Same routing as answer_question, with stages overlapped (see _prepare_async)."""
+    turn = ConversationTurn(session_id)
+    turn.add_message("user", question)
+
+    try:
+        result = await _route_async(db, question, session_id, turn)
+    except Exception:
+        await run_in_threadpool(_persist_after_error, db, turn)
+        raise
+
+    return await run_in_threadpool(_persist, db, turn, result)
+
+
+async def _route_async(db, question: str, session_id, turn: ConversationTurn) -> dict:
+    # ------------------ 0. LEXICAL FAQ FAST PATH (no embedding) ------------------
+    result = await _lexical_async(db, question, turn)
+    if result:
+        return result
+
+    cache_version = answer_cache.version
+    lang, chat_history, faqs, docs, query_emb = await _prepare_async(db, question, session_id)
+
+    # ------------------ 1. FAQ MATCH ------------------
+    if _faq_decisive(faqs):
+        best = faqs[0]
+        answer = best["answer"]
+        turn.add_message("assistant", answer)
+        return {
+            "source": "faq",
+            "answer": answer,
+            "confidence": 1 - best["distance"],
+            "escalated": False
+        }
+
+    # ------------------ 2a. SEMANTIC ANSWER CACHE ------------------
+    cached = _cache_lookup(query_emb, lang, chat_history)
+    if cached:
+        turn.add_message("assistant", cached["answer"])
+        return _cached_result(cached)
+
+    # ------------------ 2. DOCUMENT MATCH ------------------
+    if docs and docs[0]["distance"] <= DOC_THRESHOLD:
+        prompt = build_prompt(
+            question=question,
+            chat_history=chat_history,
+            faq=None,
+            doc_context=docs[:3],
+            lang=lang
+        )
+        confidence = 1 - docs[0]["distance"]
+
+        async def generate():
+            answer = await agenerate_answer(prompt)
+            _cache_store(query_emb, lang, chat_history, answer, confidence, cache_version)
+            return answer
+
+        # 🤝 concurrent identical questions share one LLM call
+        answer = await llm_flight.ado(_answer_key(question, lang, docs[:3], chat_history), generate)
+        turn.add_message("assistant", answer)
+
+        return {
+            "source": "documents+llm",
+            "answer": answer,
+            "confidence": confidence,
+            "escalated": False
+        }
+
+    # ------------------ 3. NO MATCH → ESCALATE ------------------
+    turn.escalate(question=question, bot_answer=None, confidence=0.0)
+    turn.add_message("assistant", ESCALATION_ANSWER)
+    return _escalation_result()
+
+
+async def stream_answer(db, question: str, session_id: str | None = None):
+    """
+    Streaming variant of answer_question_async.
+    Yields (event, data) pairs:
+      ("meta",  {source, confidence, escalated})
+      ("token", {text})                 one per LLM delta, or the full FAQ answer
+      ("done",  full AskResponse dict)
+    The turn is written in one commit once the stream ends; if the client
+    goes away mid-stream, the question and any partial answer are saved.
+    """
+    turn = ConversationTurn(session_id)
+    turn.add_message("user", question)
+
+    failed = False
+    try:
+        async for event in _stream_route(db, question, session_id, turn):
+            yield event
+    except Exception:
+        failed = True
+        raise
+    finally:
+        # completion, error, cancellation and aclose() (disconnect)
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(_persist_after_error if failed else persist_turn, db, turn)
+
+
+async def _stream_route(db, question: str, session_id, turn: ConversationTurn):
+    def send_at_once(result):
+        return [
+            ("meta", {k: result[k] for k in ("source", "confidence", "escalated")}),
+            ("token", {"text": result["answer"]}),
+            ("done", result),
+        ]
+
+    # ------------------ 0. LEXICAL FAQ FAST PATH → send at once ------------------
+    result = await _lexical_async(db, question, turn)
+    if result:
+        for event in send_at_once(result):
+            yield event
+        return
+
+    cache_version = answer_cache.version
+    lang, chat_history, faqs, docs, query_emb = await _prepare_async(db, question, session_id)
+
+    # ------------------ 1. FAQ MATCH → send at once ------------------
+    if _faq_decisive(faqs):
+        best = faqs[0]
+        result = {
+            "source": "faq",
+            "answer": best["answer"],
+            "confidence": 1 - best["distance"],
+            "escalated": False
+        }
+        turn.add_message("assistant", result["answer"])
+        for event in send_at_once(result):
+            yield event
+        return
+
+    # ------------------ 2a. SEMANTIC ANSWER CACHE → send at once ------------------
+    cached = _cache_lookup(query_emb, lang, chat_history)
+    if cached:
+        result = _cached_result(cached)
+        turn.add_message("assistant", result["answer"])
+        for event in send_at_once(result):
+            yield event
+        return
+
+    # ------------------ 2. DOCUMENT MATCH → stream tokens ------------------
+    if docs and docs[0]["distance"] <= DOC_THRESHOLD:
+        confidence = 1 - docs[0]["distance"]
+        yield "meta", {"source": "documents+llm", "confidence": confidence, "escalated": False}
+
+        prompt = build_prompt(
+            question=question,
+            chat_history=chat_history,
+            faq=None,
+            doc_context=docs[:3],
+            lang=lang
+        )
+
+        parts = []
+        tokens = astream_answer(prompt)
+        try:
+            async for delta in tokens:
+                parts.append(delta)
+                yield "token", {"text": delta}
+        finally:
+            # Runs on completion, cancellation and aclose() (disconnect):
+            # release the upstream stream, then stage what we have.
+            with anyio.CancelScope(shield=True):
+                await tokens.aclose()
+            if parts:
+                turn.add_message("assistant", "".join(parts))
+
+        # Only complete answers are cached
+        _cache_store(query_emb, lang, chat_history, "".join(parts), confidence, cache_version)
+
+        yield "done", {
+            "source": "documents+llm",
+            "answer": "".join(parts),
+            "confidence": confidence,
+            "escalated": False
+        }
+        return
+
+    # ------------------ 3. NO MATCH → ESCALATE ------------------
+    # Written before "done" so the event carries the escalation id
+    turn.escalate(question=question, bot_answer=None, confidence=0.0)
+    turn.add_message("assistant", ESCALATION_ANSWER)
+    result = await run_in_threadpool(_persist, db, turn, _escalation_result())
+    for event in send_at_once(result):
+        yield event
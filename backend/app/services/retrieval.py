@@ -1,19 +1,30 @@
 from sqlalchemy import text
-from app.db.session import engine
+from app.db.session import connection_for
+from app.services.ann import apply_ef_search
+from app.services.faq_index import faq_index
 
 
-def retrieve_faqs(query_embedding, k=3):
+def retrieve_faqs(query_embedding, k=3, ef_search: int | None = None, db=None):
     if not query_embedding:
         return []
 
-    with engine.connect() as conn:
+    # ⚡ In-memory index (exact search); SQL below is the fallback
+    if faq_index.ready:
+        return faq_index.search(query_embedding, k)
+
+    # Reuse the request's connection when a session is passed
+    with connection_for(db) as conn:
+        apply_ef_search(conn, ef_search)
+
+        # Distance expression must match the HNSW index (halfvec cast)
         result = conn.execute(
             text("""
                 SELECT
                     fq.question_text AS matched_question,
                     f.canonical_question,
                     f.answer_en,
-                    fq.embedding <-> (:qvec)::vector AS distance
+                    fq.embedding::halfvec(3072)
+                        <-> (:qvec)::vector::halfvec(3072) AS distance
                 FROM faq_questions fq
                 JOIN faqs f ON f.id = fq.faq_id
                 ORDER BY distance
@@ -33,3 +44,76 @@ def retrieve_faqs(query_embedding, k=3):
         })
 
     return faqs
+
+
+def retrieve_faqs_and_documents(query_embedding, k_faq=3, k_docs=3, ef_search: int | None = None, db=None):
+    """
+    Top FAQ variants and top document chunks in one statement / one round
+    trip. The query vector is bound once; each branch reads it through a
+    scalar subquery, which keeps both HNSW index scans usable.
+    Returns (faqs, docs) shaped like retrieve_faqs / retrieve_documents.
+    """
+    if not query_embedding:
+        return [], []
+
+    with connection_for(db) as conn:
+        apply_ef_search(conn, ef_search)
+
+        result = conn.execute(
+            text("""
+                WITH q AS (
+                    SELECT (:qvec)::vector::halfvec(3072) AS v
+                )
+                (
+                    SELECT 'faq' AS kind,
+                           fq.question_text AS matched_question,
+                           f.canonical_question,
+                           f.answer_en,
+                           NULL::uuid AS document_id,
+                           NULL::text AS content,
+                           NULL::integer AS chunk_index,
+                           fq.embedding::halfvec(3072) <-> (SELECT v FROM q) AS distance
+                    FROM faq_questions fq
+                    JOIN faqs f ON f.id = fq.faq_id
+                    ORDER BY distance
+                    LIMIT :k_faq
+                )
+                UNION ALL
+                (
+                    SELECT 'doc',
+                           NULL,
+                           NULL,
+                           NULL,
+                           dc.document_id,
+                           dc.content,
+                           dc.chunk_index,
+                           dc.embedding::halfvec(3072) <-> (SELECT v FROM q) AS distance
+                    FROM document_chunks dc
+                    ORDER BY distance
+                    LIMIT :k_docs
+                )
+            """),
+            {"qvec": query_embedding, "k_faq": k_faq, "k_docs": k_docs}
+        ).mappings().all()
+
+    faqs, docs = [], []
+    for row in result:
+        if row["kind"] == "faq":
+            faqs.append({
+                "question": row["canonical_question"],
+                "matched_variant": row["matched_question"],
+                "answer": row["answer_en"],
+                "distance": float(row["distance"]),
+            })
+        else:
+            docs.append({
+                "document_id": row["document_id"],
+                "content": row["content"],
+                "chunk_index": row["chunk_index"],
+                "distance": float(row["distance"]),
+            })
+
+    # UNION ALL keeps no order across branches
+    faqs.sort(key=lambda r: r["distance"])
+    docs.sort(key=lambda r: r["distance"])
+    return faqs, docs
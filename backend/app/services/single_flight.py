@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.config import settings
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution: the first
+    caller (leader) runs it, everyone arriving while it is in flight
+    waits for and receives the same result or exception. Nothing is kept
+    once the call finishes; this is coalescing, not caching.
+    Threads (`do`) and the event loop (`ado`) are tracked separately.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.deduplicated = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]):
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return fn()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, afn: Callable[[], Awaitable[Any]]):
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return await afn()
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(afn())
+            self._tasks[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.deduplicated += 1
+
+        # shield: one requester disconnecting must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved if every waiter already left
+
+    def stats(self) -> dict:
+        return {
+            "leaders": self.leaders,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._calls) + len(self._tasks),
+        }
+
+
+# Query embeddings, keyed by normalized question
+embedding_flight = SingleFlight()
+
+# LLM answers, keyed by normalized question + language + context chunks
+llm_flight = SingleFlight()
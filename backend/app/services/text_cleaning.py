@@ -1,4 +1,5 @@
 import re
+import unicodedata
 
 def clean_text(text: str) -> str:
     if not text:
@@ -14,3 +15,16 @@ def clean_text(text: str) -> str:
     text = re.sub(r"\s+", " ", text)
 
     return text.strip()
+
+
+def normalize_question(text: str) -> str:
+    """
+    Key for exact FAQ matching: NFKC, case-folded, punctuation dropped,
+    whitespace collapsed. "What's the Fee?" → "what s the fee"
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    # punctuation/symbols only; combining marks (Indic vowel signs) are kept
+    text = "".join(" " if unicodedata.category(c)[0] in "PS" else c for c in text)
+    return re.sub(r"\s+", " ", text).strip()
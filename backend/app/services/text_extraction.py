@@ -1,41 +1,186 @@
 from pypdf import PdfReader
+from pypdf.errors import PdfReadError
 from docx import Document as DocxDocument
-from pdf2image import convert_from_bytes
+from docx.opc.exceptions import OpcError
+from pdf2image import convert_from_path
 import pytesseract
-import io
+import codecs
+import os
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator
+from zipfile import BadZipFile
 
-def extract_text(file):
-    filename = file.filename.lower()
+from app.core.config import settings
 
-    # ---------- PDF ----------
-    if filename.endswith(".pdf"):
-        pdf_bytes = file.file.read()
 
-        # 1️⃣ Try normal PDF text extraction
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        text = "\n".join((page.extract_text() or "") for page in reader.pages)
+# ---------- OCR process pool ----------
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
 
-        if text.strip():
-            return text
 
-        # 2️⃣ OCR fallback for scanned PDFs
-        images = convert_from_bytes(pdf_bytes)
-        ocr_text = []
+def _ocr_worker_init():
+    # one Tesseract thread per process; the pool provides the parallelism
+    os.environ["OMP_THREAD_LIMIT"] = "1"
 
-        for img in images:
-            ocr_text.append(
-                pytesseract.image_to_string(img)
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=settings.OCR_WORKERS or os.cpu_count() or 1,
+                # spawn: ingestion runs in threads, forking them is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_ocr_worker_init,
             )
+        return _ocr_pool
+
+
+def shutdown_ocr_pool():
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is not None:
+            _ocr_pool.shutdown(wait=False, cancel_futures=True)
+            _ocr_pool = None
+
+
+def _ocr_window(pdf_path: str, first_page: int, last_page: int, dpi: int) -> list[str]:
+    """Rasterizes and OCRs pages first_page..last_page (1-based) only."""
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
+    try:
+        return [pytesseract.image_to_string(img) for img in images]
+    finally:
+        for img in images:
+            img.close()
+
+
+def _page_windows(page_numbers: list[int], window: int) -> list[tuple[int, int]]:
+    """Groups 1-based page numbers into contiguous runs of at most `window` pages."""
+    windows = []
+    for page in page_numbers:
+        if windows and page == windows[-1][1] + 1 and page - windows[-1][0] < window:
+            windows[-1] = (windows[-1][0], page)
+        else:
+            windows.append((page, page))
+    return windows
+
+
+def _ocr_pages(pdf_path: str, page_numbers: list[int]) -> dict[int, str]:
+    """
+    OCRs the given pages. Pages are rasterized a window at a time inside
+    the workers, so memory is bounded by workers x window, not page count.
+    """
+    windows = _page_windows(page_numbers, max(settings.OCR_PAGE_WINDOW, 1))
+
+    args = [(pdf_path, first, last, settings.OCR_DPI) for first, last in windows]
+    if len(windows) == 1:
+        results = [_ocr_window(*args[0])]  # not worth a process hop
+    else:
+        results = _get_ocr_pool().map(_ocr_window, *zip(*args))
+
+    texts = {}
+    for (first, _), window_texts in zip(windows, results):
+        for offset, text in enumerate(window_texts):
+            texts[first + offset] = text
+    return texts
+
+
+class UnreadableDocument(ValueError):
+    """The upload can never be ingested (corrupt, wrong encoding, no text); retrying won't help."""
 
-        return "\n".join(ocr_text)
+
+def _iter_pdf_pages(stream, on_total: Callable[[int], None]) -> Iterator[str]:
+    try:
+        reader = PdfReader(stream)
+    except PdfReadError as e:
+        raise UnreadableDocument(f"Not a readable PDF: {e}")
+    on_total(len(reader.pages))
+    # enough scanned pages to keep every OCR worker busy for one window
+    ocr_batch = max(settings.OCR_PAGE_WINDOW, 1) * (settings.OCR_WORKERS or os.cpu_count() or 1)
+
+    pdf_path = None
+    pending: list[int] = []  # scanned pages awaiting OCR, in order
+
+    def flush():
+        nonlocal pdf_path
+        if pdf_path is None:
+            # workers read the PDF from disk instead of receiving the bytes per task
+            fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                stream.seek(0)
+                shutil.copyfileobj(stream, f)
+        texts = _ocr_pages(pdf_path, pending)
+        pending.clear()
+        return [texts[n] for n in sorted(texts)]
+
+    try:
+        for number, page in enumerate(reader.pages, start=1):
+            # 1️⃣ Normal PDF text extraction
+            text = page.extract_text() or ""
+
+            # 2️⃣ OCR fallback, only for pages without a text layer
+            if not text.strip():
+                pending.append(number)
+                if len(pending) >= ocr_batch:
+                    yield from flush()
+                continue
+
+            if pending:
+                yield from flush()
+            yield text
+
+        if pending:
+            yield from flush()
+    finally:
+        if pdf_path is not None:
+            os.remove(pdf_path)
+
+
+def _count_lines(stream) -> int:
+    """Lines codecs.iterdecode will yield (a trailing newline adds none)."""
+    start = stream.tell()
+    lines, last = 0, b"\n"
+    for block in iter(lambda: stream.read(1 << 20), b""):
+        lines += block.count(b"\n")
+        last = block[-1:]
+    stream.seek(start)
+    return lines + (last != b"\n")
+
+
+def iter_pages(file, on_total: Callable[[int], None] | None = None) -> Iterator[str]:
+    """
+    Yields the upload's text page by page (paragraph by paragraph for
+    DOCX, line by line for TXT) without loading it all at once.
+    `on_total(n)` is called with the number of pages it will yield
+    before the first one, for progress reporting.
+    """
+    filename = file.filename.lower()
+    on_total = on_total or (lambda n: None)
+
+    # ---------- PDF ----------
+    if filename.endswith(".pdf"):
+        yield from _iter_pdf_pages(file.file, on_total)
+        return
 
     # ---------- DOCX ----------
     if filename.endswith(".docx"):
-        doc = DocxDocument(file.file)
-        return "\n".join(p.text for p in doc.paragraphs)
+        try:
+            doc = DocxDocument(file.file)
+        except (BadZipFile, OpcError, KeyError) as e:
+            raise UnreadableDocument(f"Not a readable DOCX: {e}")
+        on_total(len(doc.paragraphs))
+        for p in doc.paragraphs:
+            yield p.text
+        return
 
     # ---------- TXT ----------
+    on_total(_count_lines(file.file))
     try:
-        return file.file.read().decode("utf-8")
-    except Exception:
-        return ""
+        yield from codecs.iterdecode(file.file, "utf-8")
+    except UnicodeDecodeError:
+        raise UnreadableDocument("TXT file is not valid UTF-8")
+
@@ -0,0 +1,46 @@
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger("campusconnect")
+
+# gpt-4o / gpt-4o-mini tokenizer
+ENCODING_NAME = "o200k_base"
+
+# Chat format overhead per message (role + separators)
+MESSAGE_OVERHEAD = 3
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    # tiktoken fetches the encoding file on first use; without it
+    # (or offline) counts fall back to a conservative estimate
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        logger.warning("tiktoken unavailable (%s) — estimating token counts", e)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoding()
+    if enc is None:
+        return len(text) // 3 + 1
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """First `max_tokens` tokens of `text`."""
+    enc = _encoding()
+    if enc is None:
+        return text[: max_tokens * 3]
+
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    return enc.decode(ids[:max_tokens])
+
+
+def warm_up():
+    """Loads the encoding (a download on first use) now instead of on the first LLM request."""
+    _encoding()
@@ -0,0 +1,131 @@
+"""
+Recall and latency of the halfvec HNSW index vs the exact sequential scan.
+
+Builds a synthetic corpus in a scratch table (bench_chunks) on the
+database in DATABASE_URL (needs pgvector >= 0.7):
+    cd backend && python -m benchmarks.bench_ann --rows 10000 --ef 40,100,200
+
+Use --rows 1000000 for the large end; index build takes a while.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+DIM = 3072
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def random_vector():
+    return [random.uniform(-1, 1) for _ in range(DIM)]
+
+
+def build_corpus(conn, rows):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    conn.execute(text("DROP TABLE IF EXISTS bench_chunks"))
+    conn.execute(text(f"CREATE TABLE bench_chunks (id int PRIMARY KEY, embedding vector({DIM}))"))
+
+    start = time.perf_counter()
+    batch = 5000
+    for offset in range(0, rows, batch):
+        # "+ i * 0" keeps the subquery correlated so every row differs
+        conn.execute(text(f"""
+            INSERT INTO bench_chunks (id, embedding)
+            SELECT i, (
+                SELECT array_agg(random() * 2 - 1)::vector({DIM})
+                FROM generate_series(1, {DIM} + i * 0)
+            )
+            FROM generate_series(:lo, :hi) AS i
+        """), {"lo": offset + 1, "hi": min(offset + batch, rows)})
+    print(f"inserted {rows} rows in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    conn.execute(text(f"""
+        CREATE INDEX bench_chunks_hnsw ON bench_chunks
+        USING hnsw ((embedding::halfvec({DIM})) halfvec_l2_ops)
+        WITH (m = 16, ef_construction = 64)
+    """))
+    conn.execute(text("ANALYZE bench_chunks"))
+    print(f"built HNSW index in {time.perf_counter() - start:.1f}s")
+
+
+def exact_search(conn, qvec, k):
+    rows = conn.execute(text("""
+        SELECT id FROM bench_chunks
+        ORDER BY embedding <-> (:qvec)::vector
+        LIMIT :k
+    """), {"qvec": qvec, "k": k})
+    return [r[0] for r in rows]
+
+
+def ann_search(conn, qvec, k, ef):
+    conn.execute(text("SELECT set_config('hnsw.ef_search', :ef, true)"), {"ef": str(ef)})
+    rows = conn.execute(text(f"""
+        SELECT id FROM bench_chunks
+        ORDER BY embedding::halfvec({DIM}) <-> (:qvec)::vector::halfvec({DIM})
+        LIMIT :k
+    """), {"qvec": qvec, "k": k})
+    return [r[0] for r in rows]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--ef", default="40,100,200")
+    parser.add_argument("--keep", action="store_true", help="keep bench_chunks afterwards")
+    args = parser.parse_args()
+
+    random.seed(0)
+    engine = create_engine(os.environ["DATABASE_URL"])
+    queries = [random_vector() for _ in range(args.queries)]
+
+    with engine.begin() as conn:
+        build_corpus(conn, args.rows)
+
+    exact_ids = []
+    exact_ms = []
+    with engine.connect() as conn:
+        for qvec in queries:
+            with conn.begin():
+                ids, ms = timed(lambda: exact_search(conn, qvec, args.k))
+            exact_ids.append(set(ids))
+            exact_ms.append(ms)
+
+    print(f"\n{'mode':<14}{'recall@k':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    print(f"{'exact':<14}{1.0:>10.3f}{statistics.median(exact_ms):>10.2f}{percentile(exact_ms, 99):>10.2f}")
+
+    with engine.connect() as conn:
+        for ef in [int(e) for e in args.ef.split(",")]:
+            recalls = []
+            ann_ms = []
+            for qvec, truth in zip(queries, exact_ids):
+                with conn.begin():
+                    ids, ms = timed(lambda: ann_search(conn, qvec, args.k, ef))
+                recalls.append(len(truth & set(ids)) / args.k)
+                ann_ms.append(ms)
+            label = f"hnsw ef={ef}"
+            print(f"{label:<14}{statistics.mean(recalls):>10.3f}"
+                  f"{statistics.median(ann_ms):>10.2f}{percentile(ann_ms, 99):>10.2f}")
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE bench_chunks"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Embedding throughput: one request per chunk vs batched get_embeddings.
+
+Runs against the local stub server, no API key or database needed:
+    cd backend && python -m benchmarks.bench_embeddings --chunks 300
+"""
+import argparse
+import os
+import time
+
+from benchmarks.stub_server import start_stub_server
+
+server, base_url = start_stub_server()
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://bench@localhost/bench")
+os.environ.setdefault("LLM_API_URL", f"{base_url}/chat/completions")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ["EMBEDDING_API_KEY"] = "bench"
+os.environ["EMBEDDING_API_URL"] = f"{base_url}/embeddings"
+# Measure raw API throughput, not the embedding cache
+os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+os.environ["EMBEDDING_CACHE_DB"] = "false"
+
+from app.services.embeddings import get_embedding, get_embeddings  # noqa: E402
+
+
+def make_chunks(n: int) -> list[str]:
+    words = "students must submit the hostel fee before the semester begins".split()
+    return [" ".join(words * 50) + f" #{i}" for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=300)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks)
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        get_embedding(chunk)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_embeddings(chunks)
+    batched = time.perf_counter() - start
+
+    print(f"chunks:     {len(chunks)}")
+    print(f"sequential: {len(chunks) / sequential:8.1f} chunks/sec ({sequential:.2f}s)")
+    print(f"batched:    {len(chunks) / batched:8.1f} chunks/sec ({batched:.2f}s)")
+    print(f"speedup:    {sequential / batched:8.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Language detection: langdetect on every question vs detect_language
+(clearly-English short-circuit + memo cache), and how often the two
+agree: a fast path that mislabels questions shows up as disagreement.
+
+No network or database needed:
+    cd backend && python -m benchmarks.bench_language --questions 5000
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://bench@localhost/bench")
+os.environ.setdefault("LLM_API_URL", "http://localhost/chat/completions")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+from langdetect import detect  # noqa: E402
+
+from app.services.language import _classify, detect_language, warm_up  # noqa: E402
+
+# What students actually type: mostly short English, some Hinglish,
+# some Devanagari / other scripts; popular questions repeat a lot
+QUESTIONS = [
+    "When is the last date to pay the semester fee?",
+    "How do I apply for a hostel room?",
+    "Wifi password?",
+    "Where can I download my admit card?",
+    "Is there a bus from the railway station to campus?",
+    "What are the library timings on Sunday?",
+    "How do I reset my student portal password?",
+    "Can I change my elective after registration?",
+    "exam date kab hai",
+    "hostel fees kya hai",
+    "admission ka last date kya hai",
+    "scholarship form kaise bhare",
+    "मेरी फीस कब जमा होगी?",
+    "छात्रावास में कमरा कैसे मिलेगा?",
+    "परीक्षा का समय सारणी कहाँ मिलेगी?",
+    "ফি কবে জমা দিতে হবে?",
+    "ಪರೀಕ್ಷೆ ಯಾವಾಗ?",
+    "Quand commence le semestre ?",
+    "Cuando empieza el semestre?",
+    "Wann beginnt das Semester?",
+]
+
+
+def make_workload(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    # skewed: the first questions are asked far more often
+    weights = [1 / (i + 1) for i in range(len(QUESTIONS))]
+    return rng.choices(QUESTIONS, weights=weights, k=n)
+
+
+def agreement(items) -> tuple[float, dict[str, tuple[str, str]]]:
+    """Share of questions where detect_language matches langdetect, and the distinct mismatches."""
+    mismatches = {}
+    agree = 0
+    for q in items:
+        try:
+            expected = detect(q)
+        except Exception:
+            expected = "en"
+        got = detect_language(q)
+        if got == expected:
+            agree += 1
+        else:
+            mismatches[q] = (expected, got)
+    return agree / len(items), mismatches
+
+
+def timed(fn, items) -> float:
+    start = time.perf_counter()
+    for q in items:
+        fn(q)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=5000)
+    args = parser.parse_args()
+
+    workload = make_workload(args.questions)
+
+    start = time.perf_counter()
+    warm_up()
+    startup = time.perf_counter() - start
+
+    baseline = timed(detect, workload)
+    _classify.cache_clear()
+    fast = timed(detect_language, workload)
+    rate, mismatches = agreement(workload)
+
+    n = len(workload)
+    print(f"questions:      {n} ({len(set(workload))} distinct)")
+    print(f"profile load:   {1000 * startup:8.1f} ms (now at startup)")
+    print(f"langdetect:     {1e6 * baseline / n:8.1f} µs/question")
+    print(f"detect_language:{1e6 * fast / n:8.1f} µs/question")
+    print(f"speedup:        {baseline / fast:8.1f}x")
+    print(f"agreement:      {100 * rate:8.1f} % with langdetect")
+    for q, (expected, got) in mismatches.items():
+        print(f"  {q!r}: langdetect={expected} detect_language={got}")
+
+
+if __name__ == "__main__":
+    main()
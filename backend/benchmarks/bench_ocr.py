@@ -0,0 +1,113 @@
+"""
+Scanned-PDF OCR: rasterize-everything + serial Tesseract (old) vs
+windowed rasterization across the OCR process pool (iter_pages).
+
+Generates an image-only PDF, so every page goes through OCR. Needs the
+tesseract and poppler binaries, no API key or database:
+    cd backend && python -m benchmarks.bench_ocr --pages 40
+
+Each mode runs in its own process so peak RSS is measured separately.
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://bench@localhost/bench")
+os.environ.setdefault("LLM_API_URL", "http://localhost/chat/completions")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+LINES = [
+    "Students must submit the hostel fee before the semester begins.",
+    "Late payment attracts a fine of five hundred rupees per week.",
+    "The library remains open from eight in the morning to ten at night.",
+    "Examination forms are available at the academic section counter.",
+]
+
+
+def make_scanned_pdf(pages: int, path: str):
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size=28)
+    except TypeError:
+        font = ImageFont.load_default()
+
+    images = []
+    for p in range(pages):
+        img = Image.new("L", (1654, 2339), 255)  # A4 @ 200 dpi
+        draw = ImageDraw.Draw(img)
+        y = 120
+        for i in range(40):
+            draw.text((120, y), f"{p + 1}.{i + 1} {LINES[i % len(LINES)]}", fill=0, font=font)
+            y += 52
+        images.append(img)
+
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=200)
+
+
+def run_serial(pdf_bytes: bytes) -> int:
+    from pdf2image import convert_from_bytes
+    import pytesseract
+
+    images = convert_from_bytes(pdf_bytes)
+    return len([pytesseract.image_to_string(img) for img in images])
+
+
+def run_parallel(pdf_bytes: bytes) -> int:
+    from app.services.text_extraction import iter_pages, shutdown_ocr_pool
+
+    pages = list(iter_pages(SimpleNamespace(filename="scan.pdf", file=io.BytesIO(pdf_bytes))))
+    shutdown_ocr_pool()
+    return len(pages)
+
+
+def measure(mode: str, path: str):
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+
+    start = time.perf_counter()
+    (run_serial if mode == "serial" else run_parallel)(pdf_bytes)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux; RUSAGE_CHILDREN is the largest child
+    self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "self_mb": self_kb / 1024, "child_mb": child_kb / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "PDF"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        measure(*args.run)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scan.pdf")
+        make_scanned_pdf(args.pages, path)
+        print(f"pages:    {args.pages}")
+
+        for mode in ("serial", "parallel"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_ocr", "--run", mode, path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(
+                f"{mode:9} {args.pages / r['seconds']:6.2f} pages/sec ({r['seconds']:.1f}s)  "
+                f"peak RSS {r['self_mb']:.0f} MB (largest child {r['child_mb']:.0f} MB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+p50/p99 latency of the sync vs async QA pipeline under concurrent load.
+
+Needs a migrated database in DATABASE_URL; embeddings and the LLM are
+served by the local stub server. Seeds one user, session and document
+chunk matching the benchmark question, and removes them afterwards:
+    cd backend && python -m benchmarks.bench_pipeline --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_server import start_stub_server, fake_embedding
+
+server, base_url = start_stub_server()
+
+os.environ.setdefault("LLM_API_URL", f"{base_url}/chat/completions")
+os.environ["OPENAI_API_KEY"] = "bench"
+os.environ["OPENAI_BASE_URL"] = base_url
+os.environ["EMBEDDING_API_KEY"] = "bench"
+os.environ["EMBEDDING_API_URL"] = f"{base_url}/embeddings"
+os.environ["EMBEDDING_CACHE_DB"] = "false"
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+from app.db.models.chat import ChatSession, ChatMessage  # noqa: E402
+from app.db.models.document import Document  # noqa: E402
+from app.db.models.document_chunk import DocumentChunk  # noqa: E402
+from app.db.models.escalation import Escalation  # noqa: E402
+from app.services.qa_pipeline import answer_question, answer_question_async  # noqa: E402
+
+QUESTION = "When do I have to pay the hostel fee?"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def seed():
+    db = SessionLocal()
+    user = User(email=f"bench-{time.time()}@campusconnect.ai", name="bench")
+    db.add(user)
+    db.flush()
+
+    session = ChatSession(user_id=user.id)
+    doc = Document(title="bench.txt", source_type="txt", final_text="bench")
+    db.add_all([session, doc])
+    db.flush()
+
+    db.add(DocumentChunk(
+        document_id=doc.id,
+        chunk_index=0,
+        content="Hostel fees are due before the semester starts.",
+        embedding=fake_embedding(QUESTION),
+    ))
+    db.commit()
+    ids = (user.id, session.id, doc.id)
+    db.close()
+    return ids
+
+
+def cleanup(user_id, session_id, doc_id):
+    db = SessionLocal()
+    db.query(Escalation).filter(Escalation.session_id == session_id).delete()
+    db.query(ChatMessage).filter(ChatMessage.session_id == session_id).delete()
+    db.query(ChatSession).filter(ChatSession.id == session_id).delete()
+    db.query(Document).filter(Document.id == doc_id).delete()
+    db.query(User).filter(User.id == user_id).delete()
+    db.commit()
+    db.close()
+
+
+def run_sync(session_id, n, concurrency):
+    def one(i):
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            answer_question(db, f"{QUESTION} #{i}", session_id)
+        finally:
+            db.close()
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(n)))
+
+
+async def run_async(session_id, n, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            db = SessionLocal()
+            start = time.perf_counter()
+            try:
+                await answer_question_async(db, f"{QUESTION} #{i + n}", session_id)
+            finally:
+                db.close()
+            return (time.perf_counter() - start) * 1000
+
+    return await asyncio.gather(*(one(i) for i in range(n)))
+
+
+def report(label, latencies, wall):
+    print(f"{label:<8}{statistics.median(latencies):>10.1f}{percentile(latencies, 99):>10.1f}"
+          f"{len(latencies) / wall:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    user_id, session_id, doc_id = seed()
+    try:
+        print(f"{'path':<8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+
+        start = time.perf_counter()
+        latencies = run_sync(session_id, args.requests, args.concurrency)
+        report("sync", latencies, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        latencies = asyncio.run(run_async(session_id, args.requests, args.concurrency))
+        report("async", latencies, time.perf_counter() - start)
+    finally:
+        cleanup(user_id, session_id, doc_id)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
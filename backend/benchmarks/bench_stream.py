@@ -0,0 +1,65 @@
+"""
+Time-to-first-byte: buffered answer_question_async vs SSE stream_answer.
+
+For the buffered path the first byte is the whole answer; for the stream
+it is the first token event. Same setup as bench_pipeline (migrated DB in
+DATABASE_URL, stub embeddings + LLM):
+    cd backend && python -m benchmarks.bench_stream --requests 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.bench_pipeline import QUESTION, seed, cleanup, percentile, server
+from app.db.session import SessionLocal
+from app.services.qa_pipeline import answer_question_async, stream_answer
+
+
+async def buffered_ttfb(session_id, i):
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        await answer_question_async(db, f"{QUESTION} #{i}", session_id)
+        return (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+
+
+async def streamed_ttfb(session_id, i):
+    db = SessionLocal()
+    start = time.perf_counter()
+    first = None
+    try:
+        async for event, _ in stream_answer(db, f"{QUESTION} #s{i}", session_id):
+            if event == "token" and first is None:
+                first = (time.perf_counter() - start) * 1000
+        return first
+    finally:
+        db.close()
+
+
+async def run(session_id, n):
+    buffered = [await buffered_ttfb(session_id, i) for i in range(n)]
+    streamed = [await streamed_ttfb(session_id, i) for i in range(n)]
+    return buffered, streamed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    user_id, session_id, doc_id = seed()
+    try:
+        buffered, streamed = asyncio.run(run(session_id, args.requests))
+        print(f"{'path':<10}{'p50 ms':>10}{'p99 ms':>10}")
+        for label, values in (("buffered", buffered), ("stream", streamed)):
+            print(f"{label:<10}{statistics.median(values):>10.1f}{percentile(values, 99):>10.1f}")
+    finally:
+        cleanup(user_id, session_id, doc_id)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Local stand-in for the OpenAI HTTP API, used by the benchmarks.
+
+Latency is simulated so numbers reflect round trips, not model speed:
+    embeddings: EMBED_BASE_MS per request + EMBED_PER_INPUT_MS per input
+    chat:       CHAT_BASE_MS per completion; when streaming, the first
+                token after CHAT_FIRST_TOKEN_MS, the rest spread evenly
+
+Embeddings ignore a trailing " #<n>" tag, so "q #1" and "q #2" get the
+same vector but different cache keys.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBED_DIM = 3072
+EMBED_BASE_MS = 80
+EMBED_PER_INPUT_MS = 1
+CHAT_BASE_MS = 400
+CHAT_FIRST_TOKEN_MS = 120
+CHAT_ANSWER = (
+    "Hostel fees are due before the start of each semester and can be "
+    "paid online through the student portal."
+)
+
+
+def fake_embedding(text: str) -> list[float]:
+    text = text.split(" #")[0]
+    seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16)
+    rng = random.Random(seed)
+    return [rng.uniform(-1, 1) for _ in range(EMBED_DIM)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_chat(self, payload):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        words = CHAT_ANSWER.split(" ")
+        step = (CHAT_BASE_MS - CHAT_FIRST_TOKEN_MS) / 1000 / max(len(words) - 1, 1)
+        time.sleep(CHAT_FIRST_TOKEN_MS / 1000)
+
+        try:
+            for i, word in enumerate(words):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": payload.get("model"),
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"content": word if i == 0 else " " + word},
+                        "finish_reason": None,
+                    }],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(step)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client closed the stream early
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path.endswith("/embeddings"):
+            inputs = payload["input"]
+            if isinstance(inputs, str):
+                inputs = [inputs]
+            time.sleep((EMBED_BASE_MS + EMBED_PER_INPUT_MS * len(inputs)) / 1000)
+            self._send_json({
+                "object": "list",
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": fake_embedding(t)}
+                    for i, t in enumerate(inputs)
+                ],
+                "model": payload.get("model"),
+            })
+            return
+
+        if self.path.endswith("/chat/completions") and payload.get("stream"):
+            self._stream_chat(payload)
+            return
+
+        if self.path.endswith("/chat/completions"):
+            time.sleep(CHAT_BASE_MS / 1000)
+            self._send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": CHAT_ANSWER},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+            return
+
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def start_stub_server(port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/v1"
@@ -0,0 +1,104 @@
+"""
+GET /admin/faqs/ issues a fixed number of queries per page (no N+1 over
+variants) and never loads question embeddings.
+
+Runs on in-memory SQLite, no Postgres needed:
+    cd backend && python -m pytest -q tests
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://test@localhost/test")
+os.environ.setdefault("LLM_API_URL", "http://localhost/chat/completions")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest  # noqa: E402
+from fastapi import Response  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.api.routes.admin_faq import list_faqs  # noqa: E402
+from app.db.models.faq import FAQ, FAQQuestion  # noqa: E402
+
+FAQ_COUNT = 5
+VARIANTS_PER_FAQ = 3
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    FAQ.__table__.create(engine)
+    FAQQuestion.__table__.create(engine)
+
+    with Session(engine) as session:
+        for i in range(FAQ_COUNT):
+            faq = FAQ(canonical_question=f"Question {i}?", answer_en=f"Answer {i}")
+            session.add(faq)
+            session.flush()
+            for v in range(VARIANTS_PER_FAQ):
+                session.add(FAQQuestion(
+                    faq_id=faq.id,
+                    question_text=f"Question {i} variant {v}?",
+                    embedding=[0.0] * 3072,
+                ))
+        session.commit()
+
+        yield session
+
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(db):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _select_list(statement: str) -> str:
+    return statement.split(" FROM ", 1)[0]
+
+
+def test_each_page_is_two_statements_without_embeddings(db, statements):
+    pages = []
+    cursor = None
+
+    while True:
+        response = Response()
+        statements.clear()
+        db.expire_all()  # don't let the identity map hide queries
+
+        faqs = list_faqs(response=response, limit=2, cursor=cursor, q=None, db=db)
+        assert [len(f.questions) for f in faqs] == [VARIANTS_PER_FAQ] * len(faqs)
+
+        # one page query + one batched SELECT ... IN for all variants
+        assert len(statements) == 2
+        for statement in statements:
+            assert "embedding" not in _select_list(statement)
+
+        pages.append([f.id for f in faqs])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        cursor = int(cursor)
+
+    assert [len(p) for p in pages] == [2, 2, 1]
+    ids = [i for page in pages for i in page]
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == FAQ_COUNT
+
+
+def test_filtered_page_is_two_statements(db, statements):
+    statements.clear()
+    faqs = list_faqs(response=Response(), limit=10, cursor=None, q="question 3 variant", db=db)
+
+    assert [f.canonical_question for f in faqs] == ["Question 3?"]
+    assert len(statements) == 2
+    for statement in statements:
+        assert "embedding" not in _select_list(statement)
@@ -0,0 +1,37 @@
+"""
+detect_language only skips langdetect for text that is clearly English;
+short ASCII questions in other languages still get their own language.
+
+No network or database needed:
+    cd backend && python -m pytest -q tests
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://test@localhost/test")
+os.environ.setdefault("LLM_API_URL", "http://localhost/chat/completions")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest  # noqa: E402
+
+from app.services.language import detect_language, looks_english  # noqa: E402
+
+
+@pytest.mark.parametrize("question, lang", [
+    ("Quand commence le semestre ?", "fr"),
+    ("Cuando empieza el semestre?", "es"),
+    ("Wann beginnt das Semester?", "de"),
+    ("Quando comincia il semestre?", "it"),
+])
+def test_ascii_non_english_is_classified(question, lang):
+    assert not looks_english(question)
+    assert detect_language(question) == lang
+
+
+@pytest.mark.parametrize("question", [
+    "When is the last date to pay the semester fee?",
+    "How do I apply for a hostel room?",
+    "Can I change my elective after registration?",
+])
+def test_clear_english_takes_the_fast_path(question):
+    assert looks_english(question)
+    assert detect_language(question) == "en"